@@ -0,0 +1,279 @@
+"""
+Point d'entrée en ligne de commande pour colorier des plannings sans interface graphique (pas d'import de tkinter).
+Chaque fichier Planification est traité par un processus différent.
+
+Exemple :
+    python batch.py ressources/Planification.txt ressources/Planification_complexe.txt \
+        --machines ressources/Machine.txt --criteres codof codop --sortie resultats
+"""
+
+import argparse
+from collections import Counter
+import json
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+import numpy as np
+
+from core.Noeud import Noeud
+from core.Profilage import profileur
+from core.RenduRaster import HAUTEUR_LIGNE, rendu_raster, enregistrer_png
+from operators.AlgorithmeColoriage import DSATUR, ecritureFichierColoriage, ecritureFichierColonnes
+from operators.WelshPowell import WelshPowell
+from operators.Chargement import charger_planification
+from operators.Composantes import ColoriageParComposantes
+from operators.BorneInferieure import borne_inferieure
+from operators.ValidationColoriage import valider_coloriage
+
+ALGORITHMES = {"dsatur": DSATUR, "welshpowell": WelshPowell}
+
+
+def traiter_plan(
+        chemin_data: Path,
+        chemin_machines: Path,
+        criteres: list[str],
+        nom_algo: str,
+        dossier_sortie: Path,
+        max_machine_gap: int,
+        max_time_gap: timedelta,
+        seed: int | None = None,
+        profil: str | None = None,
+        composantes: int | None = None,
+        taille_shard: timedelta | None = None,
+        echelle_png: float | None = None,
+        essais: int = 1,
+        debut: datetime | None = None,
+        fin: datetime | None = None,
+        valider: bool = False,
+        colonnes: bool = False,
+        nom_sortie: str | None = None,
+        hauteur_ligne: int = HAUTEUR_LIGNE,
+        ) -> dict:
+    """
+    Colorie un planning pour chaque critère et écrit les résultats dans dossier_sortie/<nom du planning>/.
+
+    :param chemin_data: Chemin du fichier Planification.
+    :type chemin_data: Path
+    :param chemin_machines: Chemin du fichier Machine.
+    :type chemin_machines: Path
+    :param criteres: Critères à colorier, parmi Noeud.criteres_partition.
+    :type criteres: list[str]
+    :param nom_algo: Nom de l'algorithme dans ALGORITHMES.
+    :type nom_algo: str
+    :param dossier_sortie: Dossier dans lequel est créé le dossier résultat du planning.
+    :type dossier_sortie: Path
+    :param max_machine_gap: Ecart maximum en indice de centre pour être considéré voisins.
+    :type max_machine_gap: int
+    :param max_time_gap: Ecart maximum de temps pour être considéré voisins.
+    :type max_time_gap: timedelta
+    :param seed: Graine du générateur aléatoire de numpy pour des résultats reproductibles.
+    :type seed: int | None
+    :param profil: None pour ne pas profiler, "etapes" pour mesurer chaque étape, "cprofile" pour ajouter le détail cProfile.
+    :type profil: str | None
+    :param composantes: Si différent de None, colorie chaque composante connexe à part avec ce nombre de processus.
+    :type composantes: int | None
+    :param taille_shard: Si différent de None, le graphe est construit par tranches de temps de cette durée en parallèle.
+    :type taille_shard: timedelta | None
+    :param echelle_png: Si différent de None, écrit aussi l'image du diagramme avec cette échelle (pixels par heure).
+    :type echelle_png: float | None
+    :param essais: Nombre maximum d'exécutions de DSATUR, on s'arrête dès que la borne inférieure est atteinte.
+    :type essais: int
+    :param debut: Si différent de None, ne colorie que les opérations qui finissent après debut (plus la marge
+        max_time_gap pour garder leurs voisins).
+    :type debut: datetime | None
+    :param fin: Si différent de None, ne colorie que les opérations qui commencent avant fin (plus la marge).
+    :type fin: datetime | None
+    :param valider: Si True, vérifie chaque coloriage (voir valider_coloriage) et ajoute les conflits au résumé.
+    :type valider: bool
+    :param colonnes: Si True, écrit aussi le résultat au format colonnaire (voir ecritureFichierColonnes).
+    :type colonnes: bool
+    :param nom_sortie: Nom du dossier résultat, par défaut le nom du fichier Planification (voir noms_dossiers).
+    :type nom_sortie: str | None
+    :param hauteur_ligne: Hauteur en pixels de chaque ligne de l'image (avec echelle_png).
+    :type hauteur_ligne: int
+    :return: Résumé du traitement (fichier, nombre d'opérations, nombre de couleurs et borne inférieure par critère,
+        conflits si valider, mesures du profileur)
+    :rtype: dict
+    """
+    if profil is not None:
+        profileur.reinitialiser()
+        profileur.activer(cprofile=profil == "cprofile")
+    if seed is not None:
+        np.random.seed(seed)
+    dossier = dossier_sortie / (nom_sortie or chemin_data.stem)
+    dossier.mkdir(parents=True, exist_ok=True)
+
+    # Tout le pipeline reste en mémoire, aucun fichier intermédiaire n'est écrit puis relu
+    liste_noeuds, mapping_machines, donnees = charger_planification(
+        chemin_data, chemin_machines, debut, fin, marge=max_time_gap
+    )
+
+    options = {"essais": essais} if nom_algo == "dsatur" else {}
+    algo = ALGORITHMES[nom_algo](max_machine_gap, max_time_gap, taille_shard, **options)
+    if composantes is not None:
+        algo = ColoriageParComposantes(algo, composantes)
+    voisins = algo.voisins(liste_noeuds)  # Le graphe ne dépend pas du critère
+    resume = {"fichier": str(chemin_data), "nb_operations": len(liste_noeuds), "couleurs": {}, "bornes": {}}
+    if valider:
+        resume["conflits"] = {}
+    for critere in criteres:
+        coloriage = algo.trouver_coloriage(liste_noeuds, critere, voisins)
+        ecritureFichierColoriage(
+            coloriage, donnees, critere, dossier / f"Resultats_{critere}.txt"
+        )
+        if colonnes:
+            ecritureFichierColonnes(coloriage, donnees, critere, dossier / f"Resultats_{critere}")
+        resume["couleurs"][critere] = len(coloriage)
+        # DSATUR avec essais > 1 a déjà calculé la borne pour ce critère
+        borne = getattr(algo, "borne", None)
+        if borne is None:
+            borne = borne_inferieure(liste_noeuds, critere, voisins, max_machine_gap)
+        resume["bornes"][critere] = borne
+        if valider:
+            rapport = valider_coloriage(liste_noeuds, critere, coloriage, voisins)
+            resume["conflits"][critere] = [
+                (valeur1, valeur2, nombre) for valeur1, valeur2, _, nombre in rapport["conflits"]
+            ] + [(valeur, None, 0) for valeur in rapport["non_colories"]]
+        if echelle_png is not None:
+            image = rendu_raster(liste_noeuds, mapping_machines, coloriage, critere, echelle_png, hauteur_ligne)
+            enregistrer_png(image, dossier / f"Resultats_{critere}.png")
+    if profil is not None:
+        resume["profil"] = profileur.rapport()
+    return resume
+
+
+def parser_arguments(arguments: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Coloriage de plannings sans interface graphique.")
+    parser.add_argument("plannings", nargs="+", type=Path, help="Fichiers Planification à colorier")
+    parser.add_argument("--machines", type=Path, default=Path("ressources/Machine.txt"), help="Fichier Machine")
+    parser.add_argument(
+        "--criteres", nargs="+", default=["codof"], choices=Noeud.criteres_partition, help="Critères à colorier"
+    )
+    parser.add_argument("--algo", default="dsatur", choices=sorted(ALGORITHMES), help="Algorithme de coloriage")
+    parser.add_argument("--sortie", type=Path, default=Path("resultats"), help="Dossier des résultats")
+    parser.add_argument("--max-machine-gap", type=int, default=2)
+    parser.add_argument("--max-time-gap", type=float, default=21, help="Ecart de temps maximum en jours")
+    parser.add_argument(
+        "--taille-shard", type=float, default=None, metavar="JOURS",
+        help="Construit le graphe par tranches de temps de cette durée (en jours) en parallèle",
+    )
+    parser.add_argument(
+        "--png", type=float, default=None, metavar="PIXELS_PAR_HEURE",
+        help="Ecrit aussi le diagramme de Gant en PNG avec cette échelle",
+    )
+    parser.add_argument(
+        "--hauteur-ligne", type=int, default=HAUTEUR_LIGNE, metavar="PIXELS",
+        help="Hauteur de chaque ligne dans le PNG (la taille de l'image est proportionnelle)",
+    )
+    parser.add_argument(
+        "--essais", type=int, default=1,
+        help="Nombre maximum d'exécutions de DSATUR (arrêt dès que la borne inférieure est atteinte)",
+    )
+    parser.add_argument(
+        "--debut", type=datetime.fromisoformat, default=None, metavar="AAAA-MM-JJ",
+        help="Début de la fenêtre de temps à colorier",
+    )
+    parser.add_argument(
+        "--fin", type=datetime.fromisoformat, default=None, metavar="AAAA-MM-JJ",
+        help="Fin de la fenêtre de temps à colorier",
+    )
+    parser.add_argument(
+        "--valider", action="store_true",
+        help="Vérifie chaque coloriage et affiche les paires de valeurs en conflit",
+    )
+    parser.add_argument(
+        "--colonnes", action="store_true",
+        help="Ecrit aussi chaque résultat au format colonnaire (Parquet, ou un dossier .npy projetable en mémoire)",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (par défaut : nombre de coeurs)")
+    parser.add_argument("--seed", type=int, default=None, help="Graine aléatoire")
+    parser.add_argument(
+        "--composantes", type=int, default=None, metavar="N",
+        help="Colorie chaque composante connexe à part sur N processus",
+    )
+    parser.add_argument("--profil", type=Path, default=None, help="Fichier JSON où écrire les mesures de chaque étape")
+    parser.add_argument("--cprofile", action="store_true", help="Ajoute le détail cProfile aux mesures (avec --profil)")
+    return parser.parse_args(arguments)
+
+
+def noms_dossiers(chemins: list[Path]) -> list[str]:
+    """
+    Nom du dossier résultat de chaque planning : le nom du fichier, préfixé par le nom de son dossier si plusieurs
+    plannings ont le même nom de fichier, puis suivi d'un numéro s'ils sont encore identiques. Deux processus
+    n'écrivent donc jamais dans le même dossier.
+
+    :param chemins: Fichiers Planification dans l'ordre des arguments.
+    :type chemins: list[Path]
+    :return: Nom du dossier résultat de chaque fichier
+    :rtype: list[str]
+    """
+    par_nom = Counter(chemin.stem for chemin in chemins)
+    noms = [
+        chemin.stem if par_nom[chemin.stem] == 1 else f"{chemin.resolve().parent.name}_{chemin.stem}"
+        for chemin in chemins
+    ]
+    doublons = Counter(noms)
+    deja_vus = Counter()
+    resultat = []
+    for nom in noms:
+        if doublons[nom] > 1:
+            deja_vus[nom] += 1
+            nom = f"{nom}_{deja_vus[nom]}"
+        resultat.append(nom)
+    return resultat
+
+
+def main(arguments: list[str] | None = None):
+    args = parser_arguments(arguments)
+    max_time_gap = timedelta(days=args.max_time_gap)
+    profil = None
+    if args.profil is not None:
+        profil = "cprofile" if args.cprofile else "etapes"
+    rapports = {}
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [
+            executor.submit(
+                traiter_plan,
+                chemin,
+                args.machines,
+                args.criteres,
+                args.algo,
+                args.sortie,
+                args.max_machine_gap,
+                max_time_gap,
+                args.seed,
+                profil,
+                args.composantes,
+                None if args.taille_shard is None else timedelta(days=args.taille_shard),
+                args.png,
+                args.essais,
+                args.debut,
+                args.fin,
+                args.valider,
+                args.colonnes,
+                nom,
+                args.hauteur_ligne,
+            )
+            for chemin, nom in zip(args.plannings, noms_dossiers(args.plannings))
+        ]
+        for future in futures:
+            resume = future.result()
+            couleurs = ", ".join(
+                f"{critere}={n} (borne {resume['bornes'][critere]})" for critere, n in resume["couleurs"].items()
+            )
+            print(f"{resume['fichier']} : {resume['nb_operations']} opérations, couleurs : {couleurs}")
+            for critere, conflits in resume.get("conflits", {}).items():
+                for valeur1, valeur2, nombre in conflits:
+                    if valeur2 is None:
+                        print(f"    {critere} : {valeur1} n'a pas de couleur")
+                    else:
+                        print(f"    {critere} : {valeur1} et {valeur2} ont la même couleur ({nombre} arêtes)")
+            if profil is not None:
+                rapports[resume["fichier"]] = resume["profil"]
+    if args.profil is not None:
+        with open(args.profil, "w", encoding="utf-8") as f:
+            json.dump(rapports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
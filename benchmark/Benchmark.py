@@ -0,0 +1,180 @@
+"""
+Benchmark reproductible du pipeline sur des plannings synthétiques (voir GenerateurPlanification).
+Chaque étape est chronométrée avec le profileur (on garde le minimum sur les répétitions) et les résultats sont
+écrits en JSON pour pouvoir comparer deux exécutions :
+    python -m benchmark.Benchmark --operations 250 500 1000 --sortie bench_resultats.json
+    python -m benchmark.Benchmark --operations 250 500 1000 --comparer bench_resultats.json
+"""
+
+import argparse
+from datetime import datetime
+import json
+from pathlib import Path
+import platform
+import tempfile
+import numpy as np
+
+from benchmark.GenerateurPlanification import generer_planification
+from core.Profilage import profileur
+from operators.AlgorithmeColoriage import DSATUR
+from operators.WelshPowell import WelshPowell
+from operators.Chargement import charger_planification
+from operators.ValidationColoriage import tableau_aretes, valider_coloriage
+
+ALGORITHMES = {"dsatur": DSATUR, "welshpowell": WelshPowell}
+
+
+def mesurer_cas(
+        dossier: Path,
+        nb_machines: int,
+        nb_operations: int,
+        densite_chevauchement: float,
+        nb_codof: int,
+        nb_codprod: int,
+        critere: str,
+        repetitions: int,
+        seed: int,
+        ) -> dict:
+    """
+    Génère un planning synthétique puis chronomètre chaque étape du pipeline.
+
+    :return: Dictionnaire avec les paramètres du cas, la durée minimale de chaque étape en secondes, le nombre
+        de couleurs trouvé par chaque algorithme et la validité de chaque coloriage
+    :rtype: dict
+    """
+    chemin_data = dossier / f"Planification_{nb_operations}.txt"
+    chemin_machines = dossier / f"Machine_{nb_operations}.txt"
+    generer_planification(
+        chemin_data,
+        chemin_machines,
+        nb_machines=nb_machines,
+        nb_operations=nb_operations,
+        densite_chevauchement=densite_chevauchement,
+        nb_codof=nb_codof,
+        nb_codprod=nb_codprod,
+        seed=seed,
+    )
+
+    temps = {}
+    couleurs = {}
+    valides = {}
+    for _ in range(repetitions):
+        np.random.seed(seed)
+        profileur.reinitialiser()
+        liste_noeuds, _, _ = charger_planification(chemin_data, chemin_machines)
+        voisins = DSATUR().voisins(liste_noeuds)
+        aretes = tableau_aretes(liste_noeuds, voisins)
+        for nom, classe_algo in ALGORITHMES.items():
+            coloriage = classe_algo().trouver_coloriage(list(liste_noeuds), critere, voisins)
+            couleurs[nom] = len(coloriage)
+            valides[nom] = valider_coloriage(liste_noeuds, critere, coloriage, aretes=aretes)["valide"]
+        for etape, duree in profileur.durees.items():
+            temps[etape] = min(duree, temps.get(etape, float("inf")))
+
+    return {
+        "nb_machines": nb_machines,
+        "nb_operations": nb_operations,
+        "densite_chevauchement": densite_chevauchement,
+        "nb_codof": nb_codof,
+        "nb_codprod": nb_codprod,
+        "critere": critere,
+        "nb_aretes": profileur.compteurs.get("aretes_graphe"),
+        "temps": temps,
+        "couleurs": couleurs,
+        "valides": valides,
+    }
+
+
+def executer_benchmark(
+        liste_nb_operations: list[int],
+        nb_machines: int = 20,
+        densite_chevauchement: float = 0.2,
+        nb_codof: int = 200,
+        nb_codprod: int = 20,
+        critere: str = "codof",
+        repetitions: int = 3,
+        seed: int = 0,
+        ) -> dict:
+    """
+    Lance mesurer_cas pour chaque nombre d'opérations et renvoie les résultats avec des informations sur la machine.
+    """
+    actif = profileur.actif
+    profileur.activer()
+    try:
+        with tempfile.TemporaryDirectory() as dossier:
+            cas = [
+                mesurer_cas(
+                    Path(dossier),
+                    nb_machines,
+                    nb_operations,
+                    densite_chevauchement,
+                    nb_codof,
+                    nb_codprod,
+                    critere,
+                    repetitions,
+                    seed,
+                )
+                for nb_operations in liste_nb_operations
+            ]
+    finally:
+        profileur.actif = actif
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plateforme": platform.platform(),
+        "seed": seed,
+        "repetitions": repetitions,
+        "cas": cas,
+    }
+
+
+def comparer(ancien: dict, nouveau: dict):
+    """
+    Affiche pour chaque cas commun aux deux exécutions le rapport nouveau / ancien des durées de chaque étape.
+    """
+    anciens_cas = {(c["nb_machines"], c["nb_operations"], c["critere"]): c for c in ancien["cas"]}
+    for cas in nouveau["cas"]:
+        reference = anciens_cas.get((cas["nb_machines"], cas["nb_operations"], cas["critere"]))
+        if reference is None:
+            continue
+        print(f"{cas['nb_operations']} opérations, {cas['nb_machines']} machines :")
+        for etape, duree in cas["temps"].items():
+            if etape in reference["temps"]:
+                ratio = duree / reference["temps"][etape]
+                print(f"    {etape:<20} {reference['temps'][etape]:9.4f} s -> {duree:9.4f} s  (x{ratio:.2f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark du coloriage sur des plannings synthétiques.")
+    parser.add_argument("--operations", nargs="+", type=int, default=[250, 500, 1000])
+    parser.add_argument("--machines", type=int, default=20)
+    parser.add_argument("--densite", type=float, default=0.2, help="Probabilité de chevauchement")
+    parser.add_argument("--codof", type=int, default=200, help="Nombre de valeurs de codof")
+    parser.add_argument("--codprod", type=int, default=20, help="Nombre de valeurs de codprod")
+    parser.add_argument("--critere", default="codof")
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sortie", type=Path, default=Path("bench_resultats.json"))
+    parser.add_argument("--comparer", type=Path, default=None, help="Résultats d'une exécution précédente")
+    args = parser.parse_args()
+
+    resultats = executer_benchmark(
+        args.operations,
+        args.machines,
+        args.densite,
+        args.codof,
+        args.codprod,
+        args.critere,
+        args.repetitions,
+        args.seed,
+    )
+    for cas in resultats["cas"]:
+        etapes = ", ".join(f"{etape} {duree:.4f} s" for etape, duree in cas["temps"].items())
+        print(f"{cas['nb_operations']} opérations ({cas['nb_aretes']} arêtes) : {etapes} | couleurs {cas['couleurs']}")
+        if not all(cas["valides"].values()):
+            print(f"    coloriage invalide : {cas['valides']}")
+    if args.comparer is not None:
+        with open(args.comparer, encoding="utf-8") as f:
+            comparer(json.load(f), resultats)
+    with open(args.sortie, "w", encoding="utf-8") as f:
+        json.dump(resultats, f, indent=2)
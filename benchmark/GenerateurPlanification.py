@@ -0,0 +1,89 @@
+"""
+Générateur de fichiers Planification et Machine synthétiques et reproductibles (graine) pour les benchmarks.
+Les fichiers ont le même format que ressources/Planification.txt et ressources/Machine.txt.
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import numpy as np
+
+
+def generer_planification(
+        chemin_data: Path,
+        chemin_machines: Path,
+        nb_machines: int = 20,
+        nb_operations: int = 1000,
+        densite_chevauchement: float = 0.2,
+        nb_codof: int = 200,
+        nb_codprod: int = 20,
+        nb_sequences: int = 5,
+        nb_codop: int = 10,
+        debut: datetime = datetime(2025, 11, 24, 8),
+        seed: int = 0,
+        ):
+    """
+    Ecrit un planning aléatoire : les opérations sont réparties sur les machines puis enchaînées sur chaque machine,
+    avec une probabilité densite_chevauchement que l'opération commence avant la fin de la précédente
+    (ce qui force generateur_tabulaire à créer une sous-machine).
+
+    :param chemin_data: Chemin du fichier Planification à écrire.
+    :type chemin_data: Path
+    :param chemin_machines: Chemin du fichier Machine à écrire.
+    :type chemin_machines: Path
+    :param nb_machines: Nombre de centres.
+    :type nb_machines: int
+    :param nb_operations: Nombre d'opérations.
+    :type nb_operations: int
+    :param densite_chevauchement: Probabilité qu'une opération chevauche la précédente sur sa machine.
+    :type densite_chevauchement: float
+    :param nb_codof: Nombre de valeurs différentes de codof.
+    :type nb_codof: int
+    :param nb_codprod: Nombre de valeurs différentes de codprod.
+    :type nb_codprod: int
+    :param nb_sequences: Nombre de valeurs différentes de sequence.
+    :type nb_sequences: int
+    :param nb_codop: Nombre de valeurs différentes de codop.
+    :type nb_codop: int
+    :param debut: Date de début de la première opération de chaque machine.
+    :type debut: datetime
+    :param seed: Graine du générateur aléatoire.
+    :type seed: int
+    """
+    rng = np.random.default_rng(seed)
+    centres = [f"MAC{i + 1:03d}" for i in range(nb_machines)]
+
+    machine_ope = np.sort(rng.integers(0, nb_machines, nb_operations))
+    durees_min = rng.integers(30, 30 * 60, nb_operations)  # Entre 30 minutes et 30 heures
+    pauses_min = rng.integers(0, 12 * 60, nb_operations)  # Temps mort entre deux opérations
+    chevauche = rng.random(nb_operations) < densite_chevauchement
+    codof = rng.integers(0, nb_codof, nb_operations)
+    codprod = rng.integers(0, nb_codprod, nb_operations)
+    sequence = rng.integers(0, nb_sequences, nb_operations)
+    codop = rng.integers(1, nb_codop + 1, nb_operations) * 5
+
+    lignes = ["centre;codprod;codof;sequence;codop;dtedeb;dtefin"]
+    fin_precedente = {}
+    for i in range(nb_operations):
+        machine = machine_ope[i]
+        if machine not in fin_precedente:
+            date_debut = debut
+        elif chevauche[i]:
+            # On recule le début d'une fraction de la durée pour chevaucher l'opération précédente
+            date_debut = fin_precedente[machine] - timedelta(minutes=int(durees_min[i] // 2) + 1)
+        else:
+            date_debut = fin_precedente[machine] + timedelta(minutes=int(pauses_min[i]))
+        date_fin = date_debut + timedelta(minutes=int(durees_min[i]))
+        fin_precedente[machine] = max(date_fin, fin_precedente.get(machine, date_fin))
+        lignes.append(
+            f"{centres[machine]};PROD{codprod[i] + 1:02d};OF{codof[i] + 1:08d};{sequence[i]:04d};{codop[i]:04d};"
+            f"{date_debut.isoformat(sep=' ', timespec='milliseconds')};"
+            f"{date_fin.isoformat(sep=' ', timespec='milliseconds')}"
+        )
+
+    Path(chemin_data).write_text("\n".join(lignes) + "\n", encoding="utf-8")
+    Path(chemin_machines).write_text("centre\n" + "\n".join(centres) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    generer_planification(Path("Planification_synthetique.txt"), Path("Machine_synthetique.txt"))
+    print("Le résultat est dans les fichiers Planification_synthetique et Machine_synthetique")
@@ -1,15 +1,16 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from pathlib import Path
 import tkinter as tk
 from tkinter import ttk
-import pandas as pd
-import time
-from pathlib import Path
 
-from operators.GenerateurCouleur import generateur_couleur
 from core.Noeud import Noeud
+from core.Profilage import profileur
+from core.RenduRaster import MARGE_GAUCHE, temps_vers_abscisse
+from operators.BorneInferieure import borne_inferieure
 from operators.AlgorithmeColoriage import AlgorithmeColoriage, ecritureFichierColoriage
-from operators.AlgorithmeColoriage import DSATUR
-from operators.GenerateurTabulaire import generateur_tabulaire
+from operators.Surveillance import SurveillanceFichier, compare_noeuds, maj_voisins, maj_coloriage, ordre_conserve
 
 
 class CanvasTooltip:
@@ -58,9 +59,23 @@ class DiagrammeGant(tk.Frame):
         -algo_coloriage (AlgorithmeColoriage) : Algorithme de coloriage utilisé pour trouver le nombre de couleurs différentes utilisés dans le diagramme.
         -max_machine_gap (int) : Ecart maximum en indice de centre pour être considéré voisins.
         -max_time_gap (timedelta) : Ecart maximum de temps pour être considéré voisins.
+        -donnees (pd.DataFrame | None) : Planning découpé renvoyé par generateur_tabulaire, utilisé pour écrire le
+            résultat sans relire Planification_modifiee.txt. S'il vaut None, il est reconstruit à partir des noeuds.
+        -largeur_fenetre (timedelta | None) : Si elle est donnée, seules les opérations de cette fenêtre de temps
+            (plus une marge de max_time_gap) sont coloriées et dessinées, la fenêtre suit le défilement horizontal.
 
     """
 
+    # Bornes du zoom en pixels par heure
+    zoom_min = 0.02
+    zoom_max = 200
+    # En dessous de cette largeur (en pixels) les opérations consécutives de même couleur sont regroupées
+    seuil_agregation = 3
+    # Largeur minimale (en pixels) d'un rectangle pour y écrire le texte de l'opération
+    seuil_texte = 60
+    # Ecart minimal (en pixels) entre deux graduations de la ligne de temps
+    ecart_graduation = 40
+
     def __init__(
         self,
         fenetre,
@@ -69,6 +84,8 @@ class DiagrammeGant(tk.Frame):
         algo_coloriage: AlgorithmeColoriage,
         max_machine_gap: int = 8,
         max_time_gap: timedelta = timedelta(days=7),
+        largeur_fenetre: timedelta | None = None,
+        donnees=None,
     ):
         super().__init__(fenetre)
 
@@ -94,13 +111,52 @@ class DiagrammeGant(tk.Frame):
         )
         self.valider_btn.pack(side="left", padx=5)
 
-        self.liste_noeuds = liste_noeuds
+        tk.Label(self.controls, text="Zoom :", font=("Arial", 10)).pack(side="left", padx=(15, 0))
+        ttk.Button(
+            self.controls, text="-", width=3, command=lambda: self.zoom(0.5)
+        ).pack(side="left", padx=2)
+        ttk.Button(
+            self.controls, text="+", width=3, command=lambda: self.zoom(2)
+        ).pack(side="left", padx=2)
+
+        # Nombre de couleurs du coloriage et borne inférieure (aucun coloriage ne peut faire moins)
+        self.couleurs_label = tk.Label(self.controls, text="", font=("Arial", 10))
+        self.couleurs_label.pack(side="left", padx=(15, 0))
+
+        # Mesures du profileur, uniquement s'il est activé
+        self.profil_label = None
+        if profileur.actif:
+            self.profil_label = tk.Label(self.controls, text="", font=("Arial", 8), fg="gray25")
+            self.profil_label.pack(side="left", padx=10)
+
+        self.map_machines = map_machines
+        self.algo_coloriage = algo_coloriage
+        self.critere = self.critere_var.get()
+        self.donnees = donnees
+
+        # Mode fenêtre glissante : on commence sur la date du jour si elle est dans le planning, sinon au début
+        self.tous_noeuds = liste_noeuds
+        self.largeur_fenetre = largeur_fenetre
+        self._glissement = None
+        if largeur_fenetre is not None:
+            debut_plan = min(noeud.date_debut for noeud in liste_noeuds)
+            fin_plan = max(noeud.date_fin for noeud in liste_noeuds)
+            centre = min(max(datetime.now(), debut_plan + largeur_fenetre / 2), fin_plan - largeur_fenetre / 2)
+            self.debut_fenetre = centre - largeur_fenetre / 2
+            self.liste_noeuds = self.noeuds_fenetre()
+        else:
+            self.liste_noeuds = liste_noeuds
         # Partition initiale selon le critère sélectionné
         self.partition = Noeud.partition(
-            self.liste_noeuds, critere=self.critere_var.get()
+            self.liste_noeuds, critere=self.critere
         )
-        self.map_machines = map_machines
-        self.algo_coloriage = algo_coloriage
+        # Le graphe des voisins ne dépend pas du critère, on le calcule une seule fois
+        self.voisins = self.algo_coloriage.voisins(self.liste_noeuds)
+        # Bornes inférieures par critère pour le graphe actuel, calculées dans un thread pour ne pas bloquer
+        # l'interface (voir affiche_couleurs) et vidées quand le graphe change
+        self.bornes = {}
+        self.bornes_en_cours = {}
+        self.calcul_bornes = ThreadPoolExecutor(max_workers=1)
 
         self.pixels_per_hour = 5
 
@@ -125,21 +181,22 @@ class DiagrammeGant(tk.Frame):
         self.grid_columnconfigure(0, weight=1)
 
         self.coloriage = self.algo_coloriage.trouver_coloriage(
-            self.liste_noeuds, self.critere_var.get()
+            self.liste_noeuds, self.critere, self.voisins
         )
         self.dessine()
-
-        # Ajustement des scroll_region pour éviter le décalage entre la time line et les opérations
-        main_bbox = self.canvas.bbox("all")
-        xmin, _, xmax, _ = main_bbox
-        self.canvas.configure(scrollregion=main_bbox)
-        self.header.configure(scrollregion=(xmin, 0, xmax, 40))
+        self.maj_scrollregion()
+        if largeur_fenetre is not None:
+            self.update_idletasks()
+            self.va_a_date(self.debut_fenetre)
 
         self.bind_mousewheel()
+        self.affiche_couleurs(self.critere)
+        self.affiche_profil()
 
     def bind_mousewheel(self):
         self.canvas.bind_all("<MouseWheel>", self._on_mousewheel_vertical)
         self.canvas.bind_all("<Shift-MouseWheel>", self._on_mousewheel_horizontal)
+        self.canvas.bind_all("<Control-MouseWheel>", self._on_mousewheel_zoom)
 
     def _on_mousewheel_vertical(self, event):
         if event.delta:
@@ -149,6 +206,127 @@ class DiagrammeGant(tk.Frame):
         if event.delta:
             self.scroll_both("scroll", -int(event.delta / 60), "units")
 
+    def noeuds_fenetre(self) -> list[Noeud]:
+        """
+        Renvoie les noeuds de la fenêtre courante, avec une marge de max_time_gap de chaque côté pour que les
+        opérations du bord de la fenêtre aient tous leurs voisins.
+
+        :return: Noeuds à colorier et dessiner
+        :rtype: list[Noeud]
+        """
+        marge = self.algo_coloriage.max_time_gap
+        return Noeud.dans_fenetre(
+            self.tous_noeuds,
+            self.debut_fenetre - marge,
+            self.debut_fenetre + self.largeur_fenetre + marge,
+        )
+
+    def abscisse_vers_temps(self, x: float) -> datetime:
+        """
+        Convertit une abscisse du Canvas en date (inverse de temps_vers_abscisse)
+
+        :param x: Abscisse dans le Canvas
+        :type x: float
+        :return: Date correspondante
+        :rtype: datetime
+        """
+        return self.min_date + timedelta(hours=(x - MARGE_GAUCHE) / self.pixels_per_hour)
+
+    def va_a_date(self, date: datetime):
+        """
+        Fait défiler la vue pour que date soit au bord gauche.
+
+        :param date: Date à afficher au bord gauche de la vue
+        :type date: datetime
+        """
+        xmin, _, xmax, _ = (float(v) for v in self.canvas.cget("scrollregion").split())
+        self.scroll_both("moveto", max(0, (self.temps_vers_abscisse(date) - xmin) / (xmax - xmin)))
+
+    def planifie_glissement(self):
+        """
+        En mode fenêtre, vérifie la position de la vue peu après la fin du défilement (un seul recalcul pour
+        plusieurs évènements de défilement rapprochés).
+        """
+        if self.largeur_fenetre is None:
+            return
+        if self._glissement is not None:
+            self.after_cancel(self._glissement)
+        self._glissement = self.after(150, self.glisse_fenetre)
+
+    def glisse_fenetre(self):
+        """
+        Recentre la fenêtre sur la vue quand le centre de la vue s'éloigne de plus d'un quart de fenêtre du centre
+        de la fenêtre, puis recolorie les noeuds de la nouvelle fenêtre.
+        Le coloriage part de celui de l'ancienne fenêtre (voir maj_coloriage) : une valeur qui reste dans la fenêtre
+        garde sa couleur tant qu'elle n'est en conflit avec aucune valeur adjacente, seules les valeurs qui entrent
+        ou qui sont en conflit sont coloriées.
+        """
+        self._glissement = None
+        largeur = self.canvas.winfo_width()
+        centre_vue = self.abscisse_vers_temps(self.canvas.canvasx(largeur / 2))
+        centre_fenetre = self.debut_fenetre + self.largeur_fenetre / 2
+        if abs(centre_vue - centre_fenetre) <= self.largeur_fenetre / 4:
+            return
+
+        self.debut_fenetre = centre_vue - self.largeur_fenetre / 2
+        anciens = set(self.liste_noeuds)
+        self.liste_noeuds = self.noeuds_fenetre()
+        # Les noeuds restés dans la fenêtre gardent leur ordre, leurs arêtes entre eux ne changent donc pas : seules
+        # les valeurs qui gagnent ou perdent des noeuds peuvent devoir changer de couleur
+        valeurs_touchees = {getattr(noeud, self.critere) for noeud in anciens.symmetric_difference(self.liste_noeuds)}
+        self.partition = Noeud.partition(self.liste_noeuds, critere=self.critere)
+        self.voisins = self.algo_coloriage.voisins(self.liste_noeuds)
+        self.graphe_modifie()
+        self.coloriage, _ = maj_coloriage(self.coloriage, self.partition, self.voisins, valeurs_touchees)
+
+        # Le redessin ne doit pas déplacer la vue : min_date et l'échelle ne changent pas
+        x_gauche = self.canvas.canvasx(0)
+        self.dessine()
+        self.maj_scrollregion()
+        xmin, _, xmax, _ = (float(v) for v in self.canvas.cget("scrollregion").split())
+        self.scroll_both("moveto", max(0, (x_gauche - xmin) / (xmax - xmin)))
+        self.affiche_couleurs(self.critere)
+
+    def _on_mousewheel_zoom(self, event):
+        if event.delta:
+            self.zoom(1.25 if event.delta > 0 else 0.8)
+
+    def zoom(self, facteur: float):
+        """
+        Multiplie l'échelle (pixels par heure) par facteur et redessine en gardant la même date au centre de la vue.
+
+        :param facteur: Facteur de zoom, supérieur à 1 pour zoomer et inférieur à 1 pour dézoomer
+        :type facteur: float
+        """
+        pixels_per_hour = min(max(self.pixels_per_hour * facteur, self.zoom_min), self.zoom_max)
+        if pixels_per_hour == self.pixels_per_hour:
+            return
+        largeur = self.canvas.winfo_width()
+        x_centre = self.canvas.canvasx(largeur / 2)
+        date_centre = self.abscisse_vers_temps(x_centre)
+
+        self.pixels_per_hour = pixels_per_hour
+        self.dessine()
+        self.maj_scrollregion()
+
+        xmin, _, xmax, _ = (float(v) for v in self.canvas.cget("scrollregion").split())
+        x_gauche = self.temps_vers_abscisse(date_centre) - largeur / 2
+        self.scroll_both("moveto", max(0, (x_gauche - xmin) / (xmax - xmin)))
+
+    def maj_scrollregion(self):
+        """
+        Ajustement des scroll_region pour éviter le décalage entre la time line et les opérations
+        """
+        main_bbox = self.canvas.bbox("all")
+        if main_bbox:
+            xmin, ymin, xmax, ymax = main_bbox
+            if self.largeur_fenetre is not None:
+                # Seule la fenêtre est dessinée mais on doit pouvoir défiler sur tout l'horizon
+                xmin = min(xmin, 0)
+                xmax = max(xmax, self.temps_vers_abscisse(self.max_date))
+            self.canvas.configure(scrollregion=(xmin, ymin, xmax, ymax))
+            self.header.configure(scrollregion=(xmin, 0, xmax, 40))
+
     def scroll_both(self, *args):
         """
         Permet de scroll à la fois le header( ligne de temps) et le canva(diagramme avec les noeuds) 
@@ -156,6 +334,7 @@ class DiagrammeGant(tk.Frame):
         """
         self.header.xview(*args)
         self.canvas.xview(*args)
+        self.planifie_glissement()
 
     def temps_vers_abscisse(self, 
                             date: datetime
@@ -168,51 +347,249 @@ class DiagrammeGant(tk.Frame):
         :return: Coordonnées dans le Canvas
         :rtype: float
         """
-        delta_h = (date - self.min_date).total_seconds() / 3600
-        return delta_h * self.pixels_per_hour + 90
+        return temps_vers_abscisse(date, self.min_date, self.pixels_per_hour)
+
+    def affiche_couleurs(self, critere: str):
+        """
+        Affiche le nombre de couleurs utilisées et la borne inférieure pour ce critère dans la barre de contrôle.
+        La borne est gardée par critère tant que le graphe ne change pas. Si elle n'est pas encore connue, elle est
+        calculée dans un thread sur une copie du graphe et affichée quand le calcul est fini (voir attend_borne).
+
+        :param critere: Critère du coloriage affiché
+        :type critere: str
+        """
+        texte = f"Couleurs : {len(self.coloriage)}"
+        if critere in self.bornes:
+            self.couleurs_label.configure(text=f"{texte} (borne : {self.bornes[critere]})")
+            return
+        self.couleurs_label.configure(text=f"{texte} (borne : ...)")
+        if critere not in self.bornes_en_cours:
+            # Copie du graphe : la surveillance le modifie sur place pendant que le thread le parcourt
+            voisins = {noeud: set(adjacents) for noeud, adjacents in self.voisins.items()}
+            calcul = self.calcul_bornes.submit(
+                borne_inferieure, list(self.liste_noeuds), critere, voisins, self.algo_coloriage.max_machine_gap
+            )
+            self.bornes_en_cours[critere] = calcul
+            self.after(100, self.attend_borne, critere, calcul)
+
+    def attend_borne(self, critere: str, calcul):
+        """
+        Vérifie (dans la boucle tkinter) si le calcul de borne lancé par affiche_couleurs est fini et l'affiche.
+        Le résultat est ignoré si le graphe a changé entre temps.
+
+        :param critere: Critère de la borne calculée
+        :type critere: str
+        :param calcul: Calcul lancé dans le thread
+        :type calcul: concurrent.futures.Future
+        """
+        if self.bornes_en_cours.get(critere) is not calcul:
+            return
+        if not calcul.done():
+            self.after(100, self.attend_borne, critere, calcul)
+            return
+        del self.bornes_en_cours[critere]
+        self.bornes[critere] = calcul.result()
+        if critere == self.critere:
+            self.affiche_couleurs(critere)
+
+    def graphe_modifie(self):
+        """
+        Oublie les bornes calculées pour l'ancien graphe des voisins.
+        """
+        self.bornes.clear()
+        self.bornes_en_cours.clear()
+
+    def affiche_profil(self):
+        """
+        Affiche le résumé du profileur dans la barre de contrôle.
+        """
+        if self.profil_label is not None:
+            self.profil_label.configure(text=profileur.resume())
 
+    def surveiller(
+        self,
+        chemin_data: Path,
+        chemin_machines: Path,
+        intervalle: int = 5000,
+    ):
+        """
+        Active le mode surveillance : toutes les intervalle millisecondes, si le fichier Planification a changé, il
+        est relu (découpage en lignes puis chargement, en mémoire) et seules les différences sont appliquées (voir
+        applique_modifications).
+
+        :param chemin_data: Chemin du fichier Planification surveillé.
+        :type chemin_data: Path
+        :param chemin_machines: Chemin du fichier Machine.
+        :type chemin_machines: Path
+        :param intervalle: Intervalle entre deux vérifications, en millisecondes.
+        :type intervalle: int
+        """
+        self.surveillance = SurveillanceFichier(chemin_data)
+        self.chemins_surveillance = (Path(chemin_data), Path(chemin_machines))
+        self.intervalle_surveillance = intervalle
+        # Message affiché quand le fichier relu ne peut pas être chargé
+        self.surveillance_label = tk.Label(self.controls, text="", font=("Arial", 10), fg="red")
+        self.surveillance_label.pack(side="left", padx=10)
+        self.after(intervalle, self.verifie_fichier)
+
+    def verifie_fichier(self):
+        """
+        Relit le fichier surveillé s'il a changé, puis programme la vérification suivante.
+        Si le fichier ne peut pas être chargé (par exemple pendant que l'ordonnanceur l'écrit), le planning affiché
+        est gardé, l'erreur est affichée et le fichier sera relu à la vérification suivante.
+        """
+        from operators.Chargement import charger_planification
+
+        try:
+            if self.surveillance.a_change():
+                try:
+                    liste_noeuds, map_machines, donnees = charger_planification(*self.chemins_surveillance)
+                except Exception as erreur:
+                    self.surveillance.oublier()
+                    self.surveillance_label.configure(text=f"Lecture impossible : {erreur!r}")
+                    print(f"Lecture impossible de {self.chemins_surveillance[0]} : {erreur!r}")
+                    return
+                self.surveillance_label.configure(text="")
+                self.donnees = donnees
+                self.applique_modifications(liste_noeuds, map_machines)
+        finally:
+            # La surveillance continue même si la relecture ou la mise à jour a échoué
+            self.after(self.intervalle_surveillance, self.verifie_fichier)
+
+    def applique_modifications(self, liste_noeuds: list[Noeud], map_machines: dict[str, int]):
+        """
+        Applique un nouveau planning en ne recalculant que ce qui a changé : les noeuds ajoutés, supprimés ou modifiés
+        (clé codof, sequence, codop) sont appliqués au graphe des voisins et au coloriage, puis seules les lignes
+        concernées sont redessinées. Si les lignes du diagramme ou les dates extrêmes changent, tout est redessiné.
+        Si des opérations conservées changent d'ordre dans le fichier, leurs arêtes peuvent changer (voir
+        ordre_conserve) : le graphe est alors reconstruit et toutes les valeurs sont vérifiées par maj_coloriage.
+
+        :param liste_noeuds: Noeuds du nouveau planning.
+        :type liste_noeuds: list[Noeud]
+        :param map_machines: Dictionnaire qui associe chaque centre à sa ligne dans le nouveau planning.
+        :type map_machines: dict[str, int]
+        """
+        tous_noeuds, ajoutes, supprimes, modifies = compare_noeuds(self.tous_noeuds, liste_noeuds)
+        if (
+            not (ajoutes or supprimes or modifies)
+            and map_machines == self.map_machines
+            and ordre_conserve(self.tous_noeuds, tous_noeuds)
+        ):
+            return
+        self.tous_noeuds = tous_noeuds
+        nouvelle_liste = self.noeuds_fenetre() if self.largeur_fenetre is not None else tous_noeuds
+
+        # Les noeuds inchangés sont les mêmes objets (voir compare_noeuds), une différence d'ensembles suffit
+        anciens = set(self.liste_noeuds)
+        nouveaux = set(nouvelle_liste)
+        retires = [noeud for noeud in self.liste_noeuds if noeud not in nouveaux]
+        ajoutes = [noeud for noeud in nouvelle_liste if noeud not in anciens]
+        ordre_garde = ordre_conserve(self.liste_noeuds, nouvelle_liste)
+        self.liste_noeuds = nouvelle_liste
+        if ordre_garde:
+            maj_voisins(
+                self.voisins,
+                self.liste_noeuds,
+                retires,
+                ajoutes,
+                self.algo_coloriage.max_machine_gap,
+                self.algo_coloriage.max_time_gap,
+            )
+        else:
+            self.voisins = self.algo_coloriage.voisins(self.liste_noeuds)
+        self.graphe_modifie()
+        self.partition = Noeud.partition(self.liste_noeuds, critere=self.critere)
+        if ordre_garde:
+            valeurs_touchees = {getattr(noeud, self.critere) for noeud in retires + ajoutes}
+        else:
+            valeurs_touchees = set(self.partition)
+        self.coloriage, recoloriees = maj_coloriage(self.coloriage, self.partition, self.voisins, valeurs_touchees)
+        profileur.compteur("operations_modifiees", len(retires) + len(ajoutes))
+
+        min_date = min(noeud.date_debut for noeud in self.tous_noeuds)
+        max_date = max(noeud.date_fin for noeud in self.tous_noeuds)
+        if map_machines != self.map_machines or (min_date, max_date) != (self.min_date, self.max_date):
+            # Les coordonnées de tout le diagramme changent
+            self.map_machines = map_machines
+            self.dessine()
+            self.maj_scrollregion()
+        else:
+            lignes = {self.map_machines[noeud.centre] for noeud in retires + ajoutes}
+            lignes.update(
+                self.map_machines[noeud.centre] for valeur in recoloriees for noeud in self.partition[valeur]
+            )
+            self.redessine_lignes(lignes)
+        self.affiche_couleurs(self.critere)
+        self.affiche_profil()
+
+    @profileur.chronometre("dessin_canvas")
     def dessine(self):
         """
         Dessine le diagramme de Gant en dessinant la ligne de temps au dessus puis tous les noeuds en dessous.
         """
-        self.min_date = min(noeud.date_debut for noeud in self.liste_noeuds)
-        self.max_date = max(noeud.date_fin for noeud in self.liste_noeuds)
+        # Bornes calculées sur tout le planning pour que les abscisses ne dépendent pas de la fenêtre
+        self.min_date = min(noeud.date_debut for noeud in self.tous_noeuds)
+        self.max_date = max(noeud.date_fin for noeud in self.tous_noeuds)
 
         self.dessine_ligne_de_temps()
         self.dessine_noeud()
 
     def on_change_critere(self, event=None):
         critere = self.critere_var.get()
+        self.critere = critere
+        profileur.reinitialiser()
 
         # Recalcule la partition et le coloriage avec le nouveau critère
         self.partition = Noeud.partition(self.liste_noeuds, critere=critere)
 
         # self.voisins ne dépend pas du critère (voisinage entre noeuds)
-        # On passe la liste de noeuds et la valeur du critère à l'algorithme
+        # On passe la liste de noeuds, la valeur du critère et le graphe à l'algorithme
         self.coloriage = self.algo_coloriage.trouver_coloriage(
-            self.liste_noeuds, critere
-        )
-        # On écrit le résultat du coloriage dans un fichier texte
-        ecritureFichierColoriage(
-            self.coloriage, "ressources/Planification_modifiee.txt", critere
+            self.liste_noeuds, critere, self.voisins
         )
+        # On écrit le résultat du coloriage dans un fichier texte. Sans planning en mémoire, il est reconstruit à
+        # partir des noeuds chargés (Planification_modifiee.txt n'est plus écrit par main)
+        if self.donnees is not None:
+            donnees = self.donnees
+        else:
+            from operators.Chargement import donnees_depuis_noeuds
+
+            donnees = donnees_depuis_noeuds(self.tous_noeuds)
+        ecritureFichierColoriage(self.coloriage, donnees, critere)
         # Redessine
         self.dessine()
 
         # Remet à jour les scrollregions (comme dans __init__)
-        main_bbox = self.canvas.bbox("all")
-        if main_bbox:
-            xmin, _, xmax, _ = main_bbox
-            self.canvas.configure(scrollregion=main_bbox)
-            self.header.configure(scrollregion=(xmin, 0, xmax, 40))
+        self.maj_scrollregion()
+        self.affiche_couleurs(critere)
+        self.affiche_profil()
 
     def dessine_ligne_de_temps(self):
         """
         Dessine la barre du temps au dessus du diagramme.
+        L'écart entre deux graduations passe d'un jour à une semaine, un mois, un trimestre puis un an quand on
+        dézoome : on prend le plus petit pas qui laisse au moins ecart_graduation pixels entre deux graduations,
+        pour que les dates restent lisibles et que le nombre de graduations reste borné.
         """
         ## !!! A finir, echelle de temps décalé par rapport aux opérations
         self.header.delete("all")
         start = datetime(self.min_date.year, self.min_date.month, self.min_date.day)
+        pixels_par_jour = self.pixels_per_hour * 24
+        if pixels_par_jour >= self.ecart_graduation:
+            format_date = "%d/%m"
+            prochaine = lambda d: d + timedelta(days=1)
+        elif 7 * pixels_par_jour >= self.ecart_graduation:
+            format_date = "%d/%m"
+            start -= timedelta(days=start.weekday())  # On commence au lundi
+            prochaine = lambda d: d + timedelta(days=7)
+        else:
+            # Pas de 1, 3 ou 12 mois, l'écart est calculé avec le mois le plus court (28 jours)
+            pas_mois = next((pas for pas in (1, 3) if 28 * pas * pixels_par_jour >= self.ecart_graduation), 12)
+            format_date = "%m/%Y" if pas_mois < 12 else "%Y"
+            start = datetime(start.year, (start.month - 1) // pas_mois * pas_mois + 1, 1)
+            prochaine = lambda d: datetime(
+                d.year + (d.month - 1 + pas_mois) // 12, (d.month - 1 + pas_mois) % 12 + 1, 1
+            )
         date = start
 
         while date <= self.max_date:
@@ -222,15 +599,67 @@ class DiagrammeGant(tk.Frame):
                 x + 2,
                 20,
                 anchor="w",
-                text=date.strftime("%d/%m"),
+                text=date.strftime(format_date),
                 font=("Arial", 6),
                 fill="black",
             )
-            date += timedelta(days=1)
+            date = prochaine(date)
+
+    def regroupe_operations(
+        self, operations: list[tuple[Noeud, str]]
+    ) -> list[tuple[float, float, str, list[Noeud]]]:
+        """
+        Regroupe les opérations d'une même ligne pour le dessin quand on a dézoomé : deux opérations qui se suivent
+        (moins d'un pixel entre elles) sont dessinées comme un seul rectangle si elles ont la même couleur et que l'une
+        des deux fait moins de seuil_agregation pixels, ou si la deuxième fait moins d'un pixel.
+        Il y a donc au plus un rectangle par pixel de largeur sur chaque ligne.
+
+        :param operations: Les noeuds d'une ligne avec leur couleur hexadécimale
+        :type operations: list[tuple[Noeud, str]]
+        :return: Liste des rectangles à dessiner (x1, x2, couleur, noeuds regroupés)
+        :rtype: list[tuple[float, float, str, list[Noeud]]]
+        """
+        rectangles = []
+        for noeud, hex_color in sorted(operations, key=lambda ope: ope[0].date_debut):
+            x1 = self.temps_vers_abscisse(noeud.date_debut)
+            x2 = self.temps_vers_abscisse(noeud.date_fin)
+            if rectangles and x1 - rectangles[-1][1] < 1:
+                precedent = rectangles[-1]
+                etroit = min(x2 - x1, precedent[1] - precedent[0]) < self.seuil_agregation
+                if (etroit and hex_color == precedent[2]) or x2 - x1 < 1:
+                    precedent[1] = max(precedent[1], x2)
+                    precedent[3].append(noeud)
+                    continue
+            rectangles.append([x1, x2, hex_color, [noeud]])
+        return [tuple(rectangle) for rectangle in rectangles]
+
+    def operations_par_ligne(self) -> dict[int, list[tuple[Noeud, str]]]:
+        """
+        Range les noeuds dessinés par ligne avec leur couleur hexadécimale.
+
+        :return: Dictionnaire avec pour clé l'indice de la ligne et pour valeur ses noeuds avec leur couleur
+        :rtype: dict[int, list[tuple[Noeud, str]]]
+        """
+        operations_par_ligne = defaultdict(list)
+        for couleur, critere_par_couleur in self.coloriage.items():
+            r, g, b = couleur
+            rgb = (
+                int(r),
+                int(g),
+                int(b),
+            )
+            hex_color = "#%02x%02x%02x" % rgb
+            for critere in critere_par_couleur:
+                for noeud in self.partition[critere]:
+                    operations_par_ligne[self.map_machines[noeud.centre]].append(
+                        (noeud, hex_color)
+                    )
+        return operations_par_ligne
 
     def dessine_noeud(self):
         """
-        Dessine chaque Noeud du diagramme
+        Dessine chaque Noeud du diagramme, en regroupant les opérations trop étroites (voir regroupe_operations)
+        et en n'écrivant le texte que dans les rectangles assez larges.
         """
         self.canvas.delete("all")
         lane_height = 80
@@ -247,104 +676,107 @@ class DiagrammeGant(tk.Frame):
                 font=("Arial", 11, "bold"),
                 fill="black",
             )
-        for couleur, critere_par_couleur in self.coloriage.items():
-            for critere in critere_par_couleur:
-                for noeud in self.partition[critere]:
-                    x1 = self.temps_vers_abscisse(noeud.date_debut)
-                    x2 = self.temps_vers_abscisse(noeud.date_fin)
-
-                    r, g, b = couleur
-                    rgb = (
-                        int(r),
-                        int(g),
-                        int(b),
-                    )
-                    y = 20 + self.map_machines[noeud.centre] * lane_height
-                    hex_color = "#%02x%02x%02x" % rgb
-
-                    # Dessin du rectangle
-                    rectangle = self.canvas.create_rectangle(
-                        x1,
-                        y,
-                        x2,
-                        y + rect_height,
-                        fill=hex_color,
-                        outline="black",
-                    )
 
-                    # Et ajout des informations quand on hover
-                    tooltip_text = (
-                        f"Centre: {noeud.centre}\n"
-                        f"Prod: {noeud.codprod}\n"
-                        f"OF: {noeud.codof}\n"
-                        f"Sequence: {noeud.sequence}\n"
-                        f"Operation: {noeud.codop}\n"
-                        f"Start: {noeud.date_debut}\n"
-                        f"End: {noeud.date_fin}"
-                    )
-                    tooltip = CanvasTooltip(self.canvas, tooltip_text)
+        for indice, operations in self.operations_par_ligne().items():
+            self.dessine_ligne(indice, operations)
 
-                    self.canvas.tag_bind(
-                        rectangle,
-                        "<Enter>",
-                        lambda e, t=tooltip: t.show(e.x_root, e.y_root),
-                    )
-                    self.canvas.tag_bind(
-                        rectangle, "<Leave>", lambda e, t=tooltip: t.hide()
-                    )
+    def redessine_lignes(self, lignes: set[int]):
+        """
+        Efface et redessine uniquement les opérations de certaines lignes (les autres éléments du Canvas ne
+        changent pas).
 
-                    # Avec le texte à l'intérieur
-                    text = f"{noeud.codof} \n {noeud.codop} \n {noeud.codprod}"
-                    self.canvas.create_text(
-                        x1 + 5,
-                        y + rect_height / 2,
-                        anchor="w",
-                        text=text,
-                        font=("Arial", 8),
-                        fill="black",
-                    )
+        :param lignes: Indices des lignes à redessiner
+        :type lignes: set[int]
+        """
+        operations_par_ligne = self.operations_par_ligne()
+        for indice in lignes:
+            self.canvas.delete(f"ligne_{indice}")
+            self.dessine_ligne(indice, operations_par_ligne.get(indice, []))
+
+    def dessine_ligne(self, indice: int, operations: list[tuple[Noeud, str]]):
+        """
+        Dessine les opérations d'une ligne, tous les éléments créés ont le tag ligne_<indice>.
 
+        :param indice: Indice de la ligne
+        :type indice: int
+        :param operations: Les noeuds de la ligne avec leur couleur hexadécimale
+        :type operations: list[tuple[Noeud, str]]
+        """
+        lane_height = 80
+        rect_height = 80
+        tag = f"ligne_{indice}"
+
+        y = 20 + indice * lane_height
+        for x1, x2, hex_color, noeuds in self.regroupe_operations(operations):
+            # Dessin du rectangle, sans contour s'il est trop étroit pour que la couleur reste visible
+            rectangle = self.canvas.create_rectangle(
+                x1,
+                y,
+                x2,
+                y + rect_height,
+                fill=hex_color,
+                outline="black" if x2 - x1 >= self.seuil_agregation else "",
+                tags=tag,
+            )
+
+            # Et ajout des informations quand on hover
+            noeud = noeuds[0]
+            if len(noeuds) == 1:
+                tooltip_text = (
+                    f"Centre: {noeud.centre}\n"
+                    f"Prod: {noeud.codprod}\n"
+                    f"OF: {noeud.codof}\n"
+                    f"Sequence: {noeud.sequence}\n"
+                    f"Operation: {noeud.codop}\n"
+                    f"Start: {noeud.date_debut}\n"
+                    f"End: {noeud.date_fin}"
+                )
+            else:
+                tooltip_text = (
+                    f"Centre: {noeud.centre}\n"
+                    f"{len(noeuds)} opérations\n"
+                    f"Start: {noeud.date_debut}\n"
+                    f"End: {max(n.date_fin for n in noeuds)}"
+                )
+            tooltip = CanvasTooltip(self.canvas, tooltip_text)
+
+            self.canvas.tag_bind(
+                rectangle,
+                "<Enter>",
+                lambda e, t=tooltip: t.show(e.x_root, e.y_root),
+            )
+            self.canvas.tag_bind(
+                rectangle, "<Leave>", lambda e, t=tooltip: t.hide()
+            )
+
+            # Avec le texte à l'intérieur s'il y a la place
+            if len(noeuds) == 1 and x2 - x1 >= self.seuil_texte:
+                text = f"{noeud.codof} \n {noeud.codop} \n {noeud.codprod}"
+                self.canvas.create_text(
+                    x1 + 5,
+                    y + rect_height / 2,
+                    anchor="w",
+                    text=text,
+                    font=("Arial", 8),
+                    fill="black",
+                    tags=tag,
+                )
 
 if __name__ == "__main__":
-    generateur_tabulaire(
+    from pathlib import Path
+    from operators.AlgorithmeColoriage import DSATUR
+    from operators.Chargement import charger_planification
+
+    # On découpe Planning et Machine en cherchant les chevauchements, en mémoire
+    liste_noeuds, mapping_machines, donnees = charger_planification(
         Path("ressources/Planification.txt"), Path("ressources/Machine.txt")
-    )  # On modifie Planning et Machine en cherchant les chevauchements
-    data = pd.read_csv("ressources/Planification_modifiee.txt", dtype=str, sep=";")
-    machines = pd.read_csv("ressources/Machine_modifie.txt")
-    mapping_machines = {machines["centre"][i]: i for i in range(len(machines))}
-
-    liste_noeuds = [
-        Noeud(
-            i,
-            mapping_machines[ope["centre"]],
-            ope["centre"],
-            ope["codprod"],
-            ope["codof"],
-            ope["sequence"],
-            ope["codop"],
-            datetime.fromisoformat(ope["dtedeb"]),
-            datetime.fromisoformat(ope["dtefin"]),
-        )
-        for i, ope in data.iterrows()
-    ]
-
-    partition = Noeud.partition(
-        liste_noeuds
-    )  # Partition de la liste de noeud selon le critère par défaut codeof
-    voisins = Noeud.voisins_noeud(liste_noeuds)  # Dictionnaire des voisins des noeuds
-    voisins_partition = {
-        critere: set.union(
-            *[voisins[noeud] for noeud in noeuds]
-        )  # Dictionnaires des voisins de chaque partie de partition
-        for critere, noeuds in partition.items()
-    }
-    # print(len(partition))  # 108 valeurs différentes de codeof
+    )
 
     root = tk.Tk()
     root.title("Diagramme de Gant")
     algo = DSATUR()
     diagramme = DiagrammeGant(
-        root, liste_noeuds, mapping_machines, algo, max_time_gap=timedelta(days=7)
+        root, liste_noeuds, mapping_machines, algo, max_time_gap=timedelta(days=7), donnees=donnees
     )
     diagramme.pack(fill="both", expand=True)
 
@@ -0,0 +1,132 @@
+"""
+Construction du graphe des voisins par tranches de temps (shards) en parallèle.
+L'horizon est découpé en tranches de taille_shard. Une tranche contient les noeuds dont l'intervalle
+[date_debut, date_fin + max_time_gap] la rencontre (c'est le halo de max_time_gap) : deux noeuds voisins sont alors
+toujours ensemble dans la tranche qui contient le plus grand de leurs deux débuts.
+Chaque tranche est traitée par un processus qui renvoie ses arêtes sous forme de tableau numpy (indices dans
+liste_noeuds), les arêtes sont ensuite fusionnées et dédoublonnées.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+import os
+import numpy as np
+
+from core.Noeud import Noeud
+
+_MICROSECONDE = timedelta(microseconds=1)
+
+
+def _aretes_shard(
+        indices: np.ndarray,
+        machines: np.ndarray,
+        debuts: np.ndarray,
+        fins: np.ndarray,
+        max_machine_gap: int,
+        max_time_gap: int
+        ) -> np.ndarray:
+    """
+    Arêtes entre les noeuds d'une tranche, avec exactement la même règle que Noeud.est_voisin appelée sur
+    (liste_noeuds[i], liste_noeuds[j]) pour i < j.
+
+    :param indices: Indices (croissants) des noeuds de la tranche dans liste_noeuds.
+    :type indices: np.ndarray
+    :return: Tableau (m, 2) des arêtes (i, j) avec i < j
+    :rtype: np.ndarray
+    """
+    m, d, f = machines[indices], debuts[indices], fins[indices]
+    aretes = []
+    for r in range(len(indices) - 1):
+        mj, dj, fj = m[r + 1:], d[r + 1:], f[r + 1:]
+        di, fi = d[r], f[r]
+        proches = np.abs(mj - m[r]) <= max_machine_gap
+        chevauche = ((fi > dj) & (di < fj)) | ((fj > di) & (dj < fi))
+        # Même calcul que Noeud.est_voisin quand les périodes ne se chevauchent pas
+        ecart = np.maximum(di, fj) - np.minimum(fi, fj)
+        voisins = np.flatnonzero(proches & (chevauche | (ecart <= max_time_gap)))
+        if len(voisins):
+            aretes.append(np.column_stack((np.full(len(voisins), indices[r]), indices[r + 1 + voisins])))
+    if not aretes:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.concatenate(aretes)
+
+
+def aretes_par_shards(
+        liste_noeuds: list[Noeud],
+        max_machine_gap: int = 2,
+        max_time_gap: timedelta = timedelta(days=21),
+        taille_shard: timedelta = timedelta(days=28),
+        max_workers: int | None = None,
+        ) -> np.ndarray:
+    """
+    Renvoie les arêtes du graphe des voisins sous forme de tableau d'indices dans liste_noeuds.
+
+    :param liste_noeuds: Liste de tous les noeuds dont il faut trouver les voisins.
+    :type liste_noeuds: list[Noeud]
+    :param max_machine_gap: Ecart maximale en terme d'indice dans la liste de machines pour être considéré voisin.
+    :type max_machine_gap: int
+    :param max_time_gap: Ecart maximale en terme de temps pour être considéré voisin.
+    :type max_time_gap: timedelta
+    :param taille_shard: Durée couverte par chaque tranche.
+    :type taille_shard: timedelta
+    :param max_workers: Nombre de processus, par défaut le nombre de coeurs.
+    :type max_workers: int | None
+    :return: Tableau (m, 2) trié et sans doublon des arêtes (i, j) avec i < j
+    :rtype: np.ndarray
+    """
+    if len(liste_noeuds) < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    # Dates en microsecondes pour avoir les mêmes comparaisons qu'avec les datetime
+    machines = np.array([noeud.indice_machine for noeud in liste_noeuds], dtype=np.int64)
+    debuts = np.array([noeud.date_debut for noeud in liste_noeuds], dtype="datetime64[us]").astype(np.int64)
+    fins = np.array([noeud.date_fin for noeud in liste_noeuds], dtype="datetime64[us]").astype(np.int64)
+    gap = max_time_gap // _MICROSECONDE
+    pas = max(taille_shard // _MICROSECONDE, 1)
+
+    # Une tranche k couvre [origine + k * pas, origine + (k + 1) * pas[, un noeud y est si [debut, fin + gap] la rencontre
+    origine = debuts.min()
+    premiere = (debuts - origine) // pas
+    derniere = np.maximum((fins + gap - origine) // pas, premiere)
+    nb_shards = int(premiere.max()) + 1
+    shards = []
+    for k in range(nb_shards):
+        indices = np.flatnonzero((premiere <= k) & (derniere >= k))
+        if len(indices) > 1:
+            shards.append(indices)
+
+    if max_workers is None:
+        max_workers = os.cpu_count()
+    arguments = (machines, debuts, fins, max_machine_gap, gap)
+    if max_workers <= 1 or len(shards) <= 1:
+        resultats = [_aretes_shard(indices, *arguments) for indices in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_aretes_shard, indices, *arguments) for indices in shards]
+            resultats = [future.result() for future in futures]
+
+    resultats = [aretes for aretes in resultats if len(aretes)]
+    if not resultats:
+        return np.empty((0, 2), dtype=np.int64)
+    # Les halos font apparaître certaines arêtes dans plusieurs tranches
+    return np.unique(np.concatenate(resultats), axis=0)
+
+
+def voisins_par_shards(
+        liste_noeuds: list[Noeud],
+        max_machine_gap: int = 2,
+        max_time_gap: timedelta = timedelta(days=21),
+        taille_shard: timedelta = timedelta(days=28),
+        max_workers: int | None = None,
+        ) -> dict[Noeud, set[Noeud]]:
+    """
+    Même résultat que Noeud.voisins_noeud mais construit par tranches de temps en parallèle (voir aretes_par_shards).
+
+    :return: Dictionnaire avec pour clé un noeud et pour valeur l'ensemble de ses voisins
+    :rtype: dict[Noeud, set[Noeud]]
+    """
+    aretes = aretes_par_shards(liste_noeuds, max_machine_gap, max_time_gap, taille_shard, max_workers)
+    voisins: dict[Noeud, set[Noeud]] = {noeud: set() for noeud in liste_noeuds}
+    for i, j in aretes.tolist():
+        voisins[liste_noeuds[i]].add(liste_noeuds[j])
+        voisins[liste_noeuds[j]].add(liste_noeuds[i])
+    return voisins
@@ -3,6 +3,8 @@ from datetime import datetime, timedelta
 from collections import defaultdict
 from dataclasses import dataclass
 
+from core.Profilage import profileur
+
 
 def overlap(debut1: datetime, debut2: datetime, fin1: datetime, fin2: datetime) -> bool:
     """
@@ -68,9 +70,12 @@ class Noeud:
         liste_noeuds: list[Noeud],
         max_machine_gap: int = 2,
         max_time_gap: timedelta = timedelta(days=21),
+        taille_shard: timedelta | None = None,
+        max_workers: int | None = None,
     ) -> dict[Noeud, set[Noeud]]:
         """
         Renvoie le dictionnaire des voisins de chaque noeud.
+        Si taille_shard est donné, l'horizon est découpé en tranches de temps traitées en parallèle (voir core.GrapheShards).
 
         :param liste_noeuds: Liste de tous les noeuds dont il faut trouver les voisins.
         :type liste_noeuds: list[Noeud]
@@ -78,18 +83,33 @@ class Noeud:
         :type max_machine_gap: int
         :param max_time_gap: Ecart maximale en terme de temps pour être considéré voisin.
         :type max_time_gap: timedelta
+        :param taille_shard: Durée de chaque tranche de temps, None pour tout calculer dans le processus courant.
+        :type taille_shard: timedelta | None
+        :param max_workers: Nombre de processus utilisés avec taille_shard, par défaut le nombre de coeurs.
+        :type max_workers: int | None
         :return: Dictionnaire avec pour clé un noeud et pour valeur l'ensemble de ses voisins
         :rtype: dict[Noeud, set[Noeud]]
         """
-        voisins: dict[Noeud, set[Noeud]] = {noeud: set() for noeud in liste_noeuds}
         n = len(liste_noeuds)
-        for i in range(n - 1):
-            noeud1 = liste_noeuds[i]
-            for j in range(i + 1, n):
-                noeud2 = liste_noeuds[j]
-                if noeud1.est_voisin(noeud2, max_machine_gap, max_time_gap):
-                    voisins[noeud1].add(noeud2)
-                    voisins[noeud2].add(noeud1)
+        with profileur.mesure("voisins_noeud"):
+            if taille_shard is not None:
+                from core.GrapheShards import voisins_par_shards  # Import local, numpy n'est utile qu'ici
+
+                voisins = voisins_par_shards(
+                    liste_noeuds, max_machine_gap, max_time_gap, taille_shard, max_workers
+                )
+            else:
+                voisins: dict[Noeud, set[Noeud]] = {noeud: set() for noeud in liste_noeuds}
+                for i in range(n - 1):
+                    noeud1 = liste_noeuds[i]
+                    for j in range(i + 1, n):
+                        noeud2 = liste_noeuds[j]
+                        if noeud1.est_voisin(noeud2, max_machine_gap, max_time_gap):
+                            voisins[noeud1].add(noeud2)
+                            voisins[noeud2].add(noeud1)
+        if profileur.actif:
+            profileur.compteur("noeuds", n)
+            profileur.compteur("aretes_graphe", sum(len(v) for v in voisins.values()) // 2)
         return voisins
 
     @staticmethod
@@ -111,3 +131,25 @@ class Noeud:
             valeur_critere = noeud.__getattribute__(str(critere))
             partition[valeur_critere].add(noeud)
         return partition
+
+    @staticmethod
+    def dans_fenetre(
+        liste_noeuds: list[Noeud], debut: datetime, fin: datetime
+    ) -> list[Noeud]:
+        """
+        Renvoie les noeuds dont la période rencontre la fenêtre [debut, fin].
+
+        :param liste_noeuds: Liste des Noeuds à filtrer.
+        :type liste_noeuds: list[Noeud]
+        :param debut: Début de la fenêtre.
+        :type debut: datetime
+        :param fin: Fin de la fenêtre.
+        :type fin: datetime
+        :return: Liste des noeuds de la fenêtre, dans le même ordre que liste_noeuds.
+        :rtype: list[Noeud]
+        """
+        return [
+            noeud
+            for noeud in liste_noeuds
+            if noeud.date_fin >= debut and noeud.date_debut <= fin
+        ]
@@ -0,0 +1,174 @@
+"""
+Instrumentation légère des étapes du pipeline (découpage des lignes, chargement, voisins, coloriage, palette,
+écriture, dessin).
+Le profileur est désactivé par défaut : mesure() renvoie alors toujours le même contexte vide et compteur() ne fait
+rien, l'instrumentation ne coûte donc presque rien quand elle est éteinte.
+On l'active avec profileur.activer() ou la variable d'environnement COLORIAGE_PROFIL=1.
+"""
+
+from collections import defaultdict
+from contextlib import nullcontext
+from functools import wraps
+import json
+import os
+import time
+
+_MESURE_NULLE = nullcontext()
+
+
+class _Mesure:
+    """
+    Contexte qui ajoute au profileur la durée passée dans le bloc with.
+    """
+
+    __slots__ = ("profileur", "nom", "debut")
+
+    def __init__(self, profileur, nom: str):
+        self.profileur = profileur
+        self.nom = nom
+
+    def __enter__(self):
+        self.debut = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profileur.durees[self.nom] += time.perf_counter() - self.debut
+        self.profileur.appels[self.nom] += 1
+        return False
+
+
+class Profileur:
+    """
+    Classe qui accumule les durées par étape et des compteurs (arêtes du graphe, couleurs utilisées...).
+    Atttributs :
+        -actif (bool) : Si False, aucune mesure n'est prise.
+        -durees (dict[str, float]) : Durée cumulée en secondes de chaque étape.
+        -appels (dict[str, int]) : Nombre de passages dans chaque étape.
+        -compteurs (dict[str, int]) : Dernière valeur de chaque compteur.
+    """
+
+    def __init__(self, actif: bool = False):
+        self.actif = actif
+        self.durees = defaultdict(float)
+        self.appels = defaultdict(int)
+        self.compteurs = {}
+        self._cprofile = None
+
+    def activer(self, cprofile: bool = False):
+        """
+        Active les mesures et, si cprofile vaut True, lance aussi cProfile pour avoir le détail par fonction.
+        """
+        self.actif = True
+        if cprofile and self._cprofile is None:
+            import cProfile
+
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def desactiver(self):
+        self.actif = False
+        if self._cprofile is not None:
+            self._cprofile.disable()
+
+    def reinitialiser(self):
+        """
+        Remet à zéro les mesures sans changer l'état actif/inactif.
+        """
+        self.durees.clear()
+        self.appels.clear()
+        self.compteurs.clear()
+        if self._cprofile is not None:
+            self._cprofile.clear()
+
+    def mesure(self, nom: str):
+        """
+        Contexte mesurant la durée du bloc with sous le nom donné.
+
+        :param nom: Nom de l'étape mesurée
+        :type nom: str
+        """
+        if not self.actif:
+            return _MESURE_NULLE
+        return _Mesure(self, nom)
+
+    def chronometre(self, nom: str):
+        """
+        Décorateur équivalent à mesure() pour une fonction entière.
+
+        :param nom: Nom de l'étape mesurée
+        :type nom: str
+        """
+
+        def decorateur(fonction):
+            @wraps(fonction)
+            def fonction_mesuree(*args, **kwargs):
+                if not self.actif:
+                    return fonction(*args, **kwargs)
+                with _Mesure(self, nom):
+                    return fonction(*args, **kwargs)
+
+            return fonction_mesuree
+
+        return decorateur
+
+    def compteur(self, nom: str, valeur: int):
+        """
+        Enregistre la valeur d'un compteur (par exemple le nombre d'arêtes du graphe).
+
+        :param nom: Nom du compteur
+        :type nom: str
+        :param valeur: Valeur du compteur
+        :type valeur: int
+        """
+        if self.actif:
+            self.compteurs[nom] = valeur
+
+    def rapport(self, nb_fonctions: int = 20) -> dict:
+        """
+        Renvoie les mesures sous forme de dictionnaire sérialisable en JSON.
+
+        :param nb_fonctions: Nombre de fonctions gardées dans le détail cProfile (trié par temps cumulé)
+        :type nb_fonctions: int
+        :return: Dictionnaire avec les étapes, les compteurs et éventuellement le détail cProfile
+        :rtype: dict
+        """
+        rapport = {
+            "etapes": {
+                nom: {"duree_s": duree, "appels": self.appels[nom]}
+                for nom, duree in self.durees.items()
+            },
+            "compteurs": dict(self.compteurs),
+        }
+        if self._cprofile is not None:
+            import pstats
+
+            stats = pstats.Stats(self._cprofile).sort_stats("cumulative")
+            fonctions = []
+            for (fichier, ligne, nom), (_, nb_appels, tottime, cumtime, _) in stats.stats.items():
+                fonctions.append(
+                    {
+                        "fonction": f"{fichier}:{ligne}({nom})",
+                        "appels": nb_appels,
+                        "tottime_s": tottime,
+                        "cumtime_s": cumtime,
+                    }
+                )
+            fonctions.sort(key=lambda f: f["cumtime_s"], reverse=True)
+            rapport["cprofile"] = fonctions[:nb_fonctions]
+        return rapport
+
+    def resume(self) -> str:
+        """
+        Résumé d'une ligne des mesures, utilisé dans la barre de contrôle du diagramme.
+        """
+        etapes = " | ".join(f"{nom} {duree * 1000:.0f} ms" for nom, duree in self.durees.items())
+        compteurs = " | ".join(f"{nom} {valeur}" for nom, valeur in self.compteurs.items())
+        return " | ".join(partie for partie in (etapes, compteurs) if partie)
+
+    def ecrire_json(self, chemin: str):
+        with open(chemin, "w", encoding="utf-8") as f:
+            json.dump(self.rapport(), f, indent=2)
+
+
+# Profileur partagé par tout le pipeline
+profileur = Profileur(actif=os.environ.get("COLORIAGE_PROFIL") == "1")
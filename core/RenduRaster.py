@@ -0,0 +1,155 @@
+"""
+Rendu du diagramme de Gant sans affichage : les lignes et les opérations sont dessinées directement dans un tableau
+numpy RGB puis enregistrées en PNG (zlib uniquement, pas besoin de tkinter ni de PIL).
+Les coordonnées sont les mêmes que dans DiagrammeGant (voir temps_vers_abscisse).
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import struct
+import zlib
+import numpy as np
+
+from core.Noeud import Noeud
+from core.Profilage import profileur
+
+# Mise en page commune avec DiagrammeGant
+MARGE_GAUCHE = 90
+MARGE_HAUT = 20
+HAUTEUR_LIGNE = 80
+
+_HEURE = timedelta(hours=1)
+
+
+def temps_vers_abscisse(
+        date: datetime,
+        min_date: datetime,
+        pixels_per_hour: float
+        ) -> float:
+    """
+    Convertit une date en abscisse
+
+    :param date: Date de début ou de fin d'un Noeud
+    :type date: datetime
+    :param min_date: Date la plus petite du diagramme (abscisse MARGE_GAUCHE)
+    :type min_date: datetime
+    :param pixels_per_hour: Echelle du diagramme en pixels par heure
+    :type pixels_per_hour: float
+    :return: Coordonnées dans le Canvas
+    :rtype: float
+    """
+    delta_h = (date - min_date).total_seconds() / 3600
+    return delta_h * pixels_per_hour + MARGE_GAUCHE
+
+
+def rendu_raster(
+        liste_noeuds: list[Noeud],
+        map_machines: dict[str, int],
+        coloriage: dict[tuple[float, float, float], set[str]],
+        critere: str,
+        pixels_per_hour: float = 5,
+        hauteur_ligne: int = HAUTEUR_LIGNE,
+        ) -> np.ndarray:
+    """
+    Dessine le diagramme dans une image RGB.
+    Les opérations d'une même ligne ne doivent pas se chevaucher, ce qui est le cas après generateur_tabulaire :
+    chaque ligne est remplie en une fois avec une somme cumulée (+couleur au début, -couleur à la fin).
+
+    :param liste_noeuds: La liste des noeuds à dessiner.
+    :type liste_noeuds: list[Noeud]
+    :param map_machines: Dictionnaire qui associe chaque centre à sa ligne dans le diagramme.
+    :type map_machines: dict[str, int]
+    :param coloriage: Coloriage renvoyé par AlgorithmeColoriage.trouver_coloriage.
+    :type coloriage: dict[tuple[float, float, float], set[str]]
+    :param critere: Critère utilisé pour le coloriage.
+    :type critere: str
+    :param pixels_per_hour: Echelle en pixels par heure.
+    :type pixels_per_hour: float
+    :param hauteur_ligne: Hauteur en pixels de chaque ligne.
+    :type hauteur_ligne: int
+    :return: Image de taille (hauteur, largeur, 3), seulement la marge gauche et les lignes vides s'il n'y a aucun noeud
+    :rtype: np.ndarray
+    """
+    nb_lignes = max(map_machines.values()) + 1 if map_machines else 0
+    if not liste_noeuds:
+        # Par exemple une fenêtre de temps vide (batch.py --debut/--fin)
+        return np.full((MARGE_HAUT + nb_lignes * hauteur_ligne, MARGE_GAUCHE + 1, 3), 255, dtype=np.uint8)
+
+    with profileur.mesure("rendu_raster"):
+        min_date = min(noeud.date_debut for noeud in liste_noeuds)
+        max_date = max(noeud.date_fin for noeud in liste_noeuds)
+        largeur = int(np.ceil(temps_vers_abscisse(max_date, min_date, pixels_per_hour))) + 1
+        hauteur = MARGE_HAUT + nb_lignes * hauteur_ligne
+
+        # Palette : la couleur 0 est le blanc du fond, les couleurs du coloriage commencent à 1
+        palette = np.full((len(coloriage) + 1, 3), 255, dtype=np.uint8)
+        numero_par_critere = {}
+        for numero, (couleur, criteres) in enumerate(coloriage.items(), start=1):
+            palette[numero] = np.clip(np.asarray(couleur, dtype=np.float64), 0, 255).astype(np.uint8)
+            for c in criteres:
+                numero_par_critere[c] = numero
+
+        lignes = np.array([map_machines[noeud.centre] for noeud in liste_noeuds], dtype=np.int64)
+        couleurs = np.array(
+            [numero_par_critere.get(getattr(noeud, critere), 0) for noeud in liste_noeuds], dtype=np.int64
+        )
+        # Même calcul que temps_vers_abscisse (la conversion en heures est plus rapide que datetime64)
+        heures_debut = np.array([(noeud.date_debut - min_date) / _HEURE for noeud in liste_noeuds])
+        heures_fin = np.array([(noeud.date_fin - min_date) / _HEURE for noeud in liste_noeuds])
+        x1 = np.rint(heures_debut * pixels_per_hour + MARGE_GAUCHE).astype(np.int64)
+        x2 = np.rint(heures_fin * pixels_per_hour + MARGE_GAUCHE).astype(np.int64)
+
+        # Une rangée de pixels par ligne : +couleur au début de l'opération, -couleur à la fin, puis somme cumulée
+        rangees = np.zeros((nb_lignes, largeur + 1), dtype=np.int64)
+        np.add.at(rangees, (lignes, x1), couleurs)
+        np.add.at(rangees, (lignes, x2), -couleurs)
+        rangees = np.cumsum(rangees[:, :largeur], axis=1)
+
+        image = np.full((hauteur, largeur, 3), 255, dtype=np.uint8)
+        lignes_image = palette[rangees]  # (nb_lignes, largeur, 3)
+        zone = image[MARGE_HAUT:].reshape(nb_lignes, hauteur_ligne, largeur, 3)
+        zone[:] = lignes_image[:, None, :, :]
+
+        # Contours noirs : haut et bas de chaque opération, et bords des opérations assez larges
+        remplies = rangees > 0
+        zone[:, 0][remplies] = 0
+        zone[:, -1][remplies] = 0
+        larges = (x2 - x1) >= 3
+        for bords in (x1[larges], np.maximum(x2[larges] - 1, x1[larges])):
+            zone[lignes[larges], :, bords] = 0
+    return image
+
+
+def enregistrer_png(
+        image: np.ndarray,
+        chemin: Path,
+        niveau_compression: int = 6
+        ):
+    """
+    Ecrit une image RGB (uint8) au format PNG.
+
+    :param image: Image de taille (hauteur, largeur, 3).
+    :type image: np.ndarray
+    :param chemin: Chemin du fichier PNG.
+    :type chemin: Path
+    :param niveau_compression: Niveau de compression zlib, de 0 (rapide) à 9 (fichier plus petit).
+    :type niveau_compression: int
+    """
+    hauteur, largeur, _ = image.shape
+    # Chaque rangée commence par l'octet de filtre 0 (aucun filtre)
+    donnees = np.zeros((hauteur, largeur * 3 + 1), dtype=np.uint8)
+    donnees[:, 1:] = image.reshape(hauteur, largeur * 3)
+
+    def bloc(type_bloc: bytes, contenu: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(contenu))
+            + type_bloc
+            + contenu
+            + struct.pack(">I", zlib.crc32(type_bloc + contenu) & 0xFFFFFFFF)
+        )
+
+    with profileur.mesure("ecriture_png"), open(chemin, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(bloc(b"IHDR", struct.pack(">IIBBBBB", largeur, hauteur, 8, 2, 0, 0, 0)))
+        f.write(bloc(b"IDAT", zlib.compress(donnees.tobytes(), niveau_compression)))
+        f.write(bloc(b"IEND", b""))
@@ -1,44 +1,49 @@
-from datetime import datetime, timedelta
+import argparse
+from datetime import timedelta
 import tkinter as tk
-import pandas as pd
 from pathlib import Path
-from core.Noeud import Noeud
 from core.DiagrammeGant import DiagrammeGant
 from operators.AlgorithmeColoriage import DSATUR
 from operators.WelshPowell import WelshPowell
-from operators.GenerateurTabulaire import generateur_tabulaire
+from operators.Chargement import charger_planification
 
 if __name__ == "__main__":
-    # Initialisation des données
-    generateur_tabulaire(
+    parser = argparse.ArgumentParser(description="Affiche le diagramme de Gant colorié.")
+    parser.add_argument(
+        "--fenetre", type=float, default=None, metavar="JOURS",
+        help="Ne colorie et ne dessine qu'une fenêtre de JOURS jours qui suit le défilement",
+    )
+    parser.add_argument(
+        "--surveiller", type=float, default=None, metavar="SECONDES",
+        help="Relit Planification.txt toutes les SECONDES secondes s'il a changé et n'applique que les différences",
+    )
+    args = parser.parse_args()
+
+    # Initialisation des données : on découpe Planning et Machine en cherchant les chevauchements, en mémoire
+    liste_noeuds, mapping_machines, donnees = charger_planification(
         Path("ressources/Planification.txt"), Path("ressources/Machine.txt")
-    )  # On modifie Planning et Machine en cherchant les chevauchements
-    data = pd.read_csv("ressources/Planification_modifiee.txt", dtype=str, sep=";")
-    machines = pd.read_csv("ressources/Machine_modifie.txt")
-    mapping_machines = {machines["centre"][i]: i for i in range(len(machines))}
-    liste_noeuds = [
-        Noeud(
-            i,
-            mapping_machines[ope["centre"]],
-            ope["centre"],
-            ope["codprod"],
-            ope["codof"],
-            ope["sequence"],
-            ope["codop"],
-            datetime.fromisoformat(ope["dtedeb"]),
-            datetime.fromisoformat(ope["dtefin"]),
-        )
-        for i, ope in data.iterrows()
-    ]
+    )
 
     # Initialisation des objets
     root = tk.Tk()
     root.title("Diagramme de Gant")
     algo = DSATUR()
     diagramme = DiagrammeGant(
-        root, liste_noeuds, mapping_machines, algo, max_time_gap=timedelta(days=7)
+        root,
+        liste_noeuds,
+        mapping_machines,
+        algo,
+        max_time_gap=timedelta(days=7),
+        largeur_fenetre=timedelta(days=args.fenetre) if args.fenetre is not None else None,
+        donnees=donnees,
     )
     diagramme.pack(fill="both", expand=True)
+    if args.surveiller is not None:
+        diagramme.surveiller(
+            Path("ressources/Planification.txt"),
+            Path("ressources/Machine.txt"),
+            intervalle=int(args.surveiller * 1000),
+        )
 
     # Lancement du script
     root.mainloop()
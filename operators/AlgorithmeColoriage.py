@@ -1,23 +1,52 @@
 from abc import abstractmethod, ABC
+from collections import Counter
 from typing import List
 from core.Noeud import Noeud
+from core.Profilage import profileur
 import numpy as np
-import time
+import json
+from pathlib import Path
 from datetime import timedelta
-from operators.GenerateurCouleur import generateur_couleur, evaluer
-import basic_colormath
 
 class AlgorithmeColoriage(ABC):
     """
     Classe abstraite d'algorithme de coloriage
+    Atttributs :
+        -max_machine_gap (int) : Ecart maximum en indice de centre pour être considéré voisins.
+        -max_time_gap (timedelta) : Ecart maximum de temps pour être considéré voisins.
+        -taille_shard (timedelta | None) : Si donné, le graphe est construit par tranches de temps en parallèle.
     """
 
-    @abstractmethod
+    def __init__(
+        self,
+        max_machine_gap: int = 2,
+        max_time_gap: timedelta = timedelta(days=21),
+        taille_shard: timedelta | None = None,
+    ):
+        self.max_machine_gap = max_machine_gap
+        self.max_time_gap = max_time_gap
+        self.taille_shard = taille_shard
+
+    def voisins(self, liste_noeuds : List[Noeud]) -> dict[Noeud, set[Noeud]]:
+        """
+        Construit le graphe des voisins avec les écarts de l'algorithme.
+        Le graphe ne dépend pas du critère, on peut donc le calculer une fois et le passer à trouver_coloriage.
+
+        :param liste_noeuds: Liste de tous les noeuds dont il faut trouver les voisins.
+        :type liste_noeuds: List[Noeud]
+        :return: Dictionnaire avec pour clé un noeud et pour valeur l'ensemble de ses voisins
+        :rtype: dict[Noeud, set[Noeud]]
+        """
+        return Noeud.voisins_noeud(
+            liste_noeuds, self.max_machine_gap, self.max_time_gap, self.taille_shard
+        )
+
     def trouver_coloriage(
         self, 
         liste_noeuds : List[Noeud], 
-        critere: str
-        ) -> dict[int, set[str]]:
+        critere: str,
+        voisins: dict[Noeud, set[Noeud]] | None = None,
+        ) -> dict[tuple[float, float,float], set[str]]:
         """
         A partir de la liste des noeuds et d'fun critère, associe une couleur à chaque partie de la partition.\n
         Par exemple, le résultat est sous la forme : \n
@@ -31,110 +60,255 @@ class AlgorithmeColoriage(ABC):
         :type liste_noeuds: List[Noeud]
         :param critere: String correspondant au critere que l'on souhaite différencier sur notre coloriage
         :type critere: str
+        :param voisins: Graphe des voisins déjà calculé, s'il vaut None il est calculé avec self.voisins
+        :type voisins: dict[Noeud, set[Noeud]] | None
+        :return: Dictionnaire dont les clés sont la couleur RGB et la valeur la liste des valeurs de critères qui seront coloriés de cette couleur
+        :rtype: dict[tuple[float, float,float], set[str]]
+        """
+        return self.attribuer_couleurs(self.trouver_coloriage_indices(liste_noeuds, critere, voisins))
+
+    @abstractmethod
+    def trouver_coloriage_indices(
+        self, 
+        liste_noeuds : List[Noeud], 
+        critere: str,
+        voisins: dict[Noeud, set[Noeud]] | None = None,
+        ) -> dict[int, set[str]]:
+        """
+        Même chose que trouver_coloriage mais les couleurs sont numérotées de 0 à k-1 au lieu d'être des couleurs RGB.
+        Deux coloriages en indices peuvent ainsi être fusionnés (par exemple un par composante connexe).
+
+        :param liste_noeuds: Liste des noeuds à colorier
+        :type liste_noeuds: List[Noeud]
+        :param critere: String correspondant au critere que l'on souhaite différencier sur notre coloriage
+        :type critere: str
+        :param voisins: Graphe des voisins déjà calculé, s'il vaut None il est calculé avec self.voisins
+        :type voisins: dict[Noeud, set[Noeud]] | None
         :return: Dictionnaire dont les clés sont le numéro de couleur et la valeur la liste des valeurs de critères qui seront coloriés de cette couleur
+        :rtype: dict[int, set[str]]
+        """
+
+    @staticmethod
+    def attribuer_couleurs(coloriage : dict[int, set[str]]) -> dict[tuple[float, float,float], set[str]]:
+        """
+        Génère une palette de couleurs RGB bien distinctes et remplace chaque numéro de couleur par sa couleur RGB.
+
+        :param coloriage: Dictionnaire dont les clés sont les numéros de couleur (de 0 à k-1)
+        :type coloriage: dict[int, set[str]]
+        :return: Dictionnaire dont les clés sont les couleurs RGB
         :rtype: dict[tuple[float, float,float], set[str]]
         """
+        from operators.GenerateurCouleur import generateur_couleur  # Import local, basic_colormath est long à importer
+
+        profileur.compteur("couleurs_utilisees", len(coloriage))
+        if not coloriage:
+            # Aucune opération à colorier (par exemple une fenêtre de temps vide)
+            return {}
+        with profileur.mesure("generation_palette"):
+            liste_couleurs = generateur_couleur(len(coloriage))
+        dico_couleurs = dict(enumerate(liste_couleurs))
+
+        # On transforme les np.array en tuple pour qu'ils soient hashables et les mettre en clé
+        dico_couleurs_tuple = {key : tuple(arr) for key, arr in dico_couleurs.items()}
+
+        # On obtient le dictionnaire avec clé = couleur RGB et valeur = ensemble des noeuds de cette couleur
+        coloriage_final = {couleur_rgb : coloriage[numero] for numero, couleur_rgb in dico_couleurs_tuple.items()}
+
+        return coloriage_final
 
 class DSATUR(AlgorithmeColoriage):
     """
     Algorithme de DSATUR
+    La couleur d'un critère est tirée au hasard parmi les couleurs possibles, deux exécutions peuvent donc donner
+    des nombres de couleurs différents. Avec essais > 1, DSATUR est relancé jusqu'à essais fois en gardant le meilleur
+    coloriage et s'arrête dès que la borne inférieure (voir BorneInferieure) est atteinte.
+    Atttributs :
+        -essais (int) : Nombre maximum d'exécutions de DSATUR.
+        -aleatoire (bool) : Si False, on prend toujours la plus petite couleur possible (résultat déterministe).
+        -borne (int | None) : Borne inférieure calculée lors du dernier appel à trouver_coloriage_indices (None si
+            essais vaut 1), pour ne pas avoir à la recalculer.
     """
-    def trouver_coloriage(
+
+    def __init__(
+        self,
+        max_machine_gap: int = 2,
+        max_time_gap: timedelta = timedelta(days=21),
+        taille_shard: timedelta | None = None,
+        essais: int = 1,
+        aleatoire: bool = True,
+    ):
+        super().__init__(max_machine_gap, max_time_gap, taille_shard)
+        self.essais = essais
+        self.aleatoire = aleatoire
+        self.borne = None
+
+    def trouver_coloriage_indices(
             self,
             liste_noeuds : List[Noeud],
-            critere : str
-            ) -> dict[tuple[float, float,float], set[str]]:
+            critere : str,
+            voisins : dict[Noeud, set[Noeud]] | None = None,
+            ) -> dict[int, set[str]]:
         
         # Initialisation
+        if voisins is None:
+            voisins = self.voisins(liste_noeuds)  # Dictionnaire des voisins des noeuds
         partition = Noeud.partition(liste_noeuds, critere=critere)  # Partition de la liste de noeud selon le critère par défaut codeof
-        voisins = Noeud.voisins_noeud(liste_noeuds)  # Dictionnaire des voisins des noeuds
-        coloriage = {} # objet qui sera retourné à la fin, il donnera pour chaque couleur ses criteres
-        dsat = {noeud : 0 for noeud in voisins.keys()} # permet de suivre le score dsat de chaque noeud
-        non_colorie = set(voisins.keys()) # pour avoir un suivi des noeuds non coloriés
-        degre = {noeud: len(voisins[noeud]) for noeud in voisins.keys()}
+        meilleur = self.dsatur(partition, voisins)
+        self.borne = None
+
+        if self.essais > 1:
+            from operators.BorneInferieure import borne_inferieure
+
+            # On relance tant qu'on n'a pas atteint la borne, aucun coloriage ne peut faire mieux
+            self.borne = borne_inferieure(liste_noeuds, critere, voisins, self.max_machine_gap)
+            essai = 1
+            while essai < self.essais and len(meilleur) > self.borne:
+                coloriage = self.dsatur(partition, voisins)
+                if len(coloriage) < len(meilleur):
+                    meilleur = coloriage
+                essai += 1
+            profileur.compteur("essais_dsatur", essai)
+        return meilleur
+
+    def dsatur(
+            self,
+            partition : dict[str, set[Noeud]],
+            voisins : dict[Noeud, set[Noeud]],
+            ) -> dict[int, set[str]]:
+        """
+        Une exécution de DSATUR sur le graphe des valeurs du critère.
+        Les couleurs interdites de chaque valeur du critère sont stockées dans un entier utilisé comme masque de bits
+        (bit k à 1 si la couleur k est déjà prise par une valeur adjacente) : le DSAT est le nombre de bits à 1 et les
+        couleurs possibles s'obtiennent avec des opérations binaires, sans créer d'ensemble à chaque étape.
+
+        :param partition: Partition des noeuds selon le critère (voir Noeud.partition)
+        :type partition: dict[str, set[Noeud]]
+        :param voisins: Dictionnaire des voisins de chaque noeud
+        :type voisins: dict[Noeud, set[Noeud]]
+        :return: Dictionnaire dont les clés sont le numéro de couleur et la valeur les valeurs du critère de cette couleur
+        :rtype: dict[int, set[str]]
+        """
+        with profileur.mesure("dsatur"):
+            coloriage = {} # objet qui sera retourné à la fin, il donnera pour chaque couleur ses criteres
+            dsat = {noeud : 0 for noeud in voisins.keys()} # permet de suivre le score dsat de chaque noeud
+            non_colorie = set(voisins.keys()) # pour avoir un suivi des noeuds non coloriés
+            degre = {noeud: len(voisins[noeud]) for noeud in voisins.keys()}
         
-        # Dico des voisins par critère (équivalent à la méthode de thomas mais en plus simple à comprendre)
-        # voisins_partition associe à chaque critère l'ensemble des voisins des noeuds ayant ce critere
-        # ca nous permettra de connaitre les voisins du critere du noeud choisi
-        voisins_partition = {}
-        for critere, noeuds in partition.items():
-            voisins_critere = set()
-            for noeud in noeuds:
-                voisins_critere.update(voisins[noeud])
-            voisins_partition[critere] = voisins_critere
-
-        # Dico pour retrouver le critere du noeud choisi
-        critere_du_noeud = {}
-        for critere, noeuds in partition.items():
-            for noeud in noeuds:
-                critere_du_noeud[noeud] = critere
+            # Dico des voisins par critère (équivalent à la méthode de thomas mais en plus simple à comprendre)
+            # voisins_partition associe à chaque critère l'ensemble des voisins des noeuds ayant ce critere
+            # ca nous permettra de connaitre les voisins du critere du noeud choisi
+            voisins_partition = {}
+            for critere, noeuds in partition.items():
+                voisins_critere = set()
+                for noeud in noeuds:
+                    voisins_critere.update(voisins[noeud])
+                voisins_partition[critere] = voisins_critere
+
+            # Dico pour retrouver le critere du noeud choisi
+            critere_du_noeud = {}
+            for critere, noeuds in partition.items():
+                for noeud in noeuds:
+                    critere_du_noeud[noeud] = critere
         
-        # Couleurs adjacentes par critere, permettra de mettre à jour le dsat des voisins du critere colorié
-        # Si un critere a une couleur adjacente alors il n'a pas le droit de l'avoir
-        couleurs_adjacentes = {critere: set() for critere in partition.keys()} 
-
-        while non_colorie:
-            # Sélection du nœud avec DSAT max (degré max en cas d'égalité)
-            noeud_choisi = max(non_colorie, 
-                              key=lambda n: (dsat[n], degre[n]))
+            # Masque des couleurs adjacentes par critere, permettra de mettre à jour le dsat des voisins du critere colorié
+            # Si un critere a une couleur adjacente alors il n'a pas le droit de l'avoir
+            couleurs_adjacentes = {critere: 0 for critere in partition.keys()}
+
+            while non_colorie:
+                # Sélection du nœud avec DSAT max (degré max en cas d'égalité)
+                noeud_choisi = max(non_colorie, 
+                                  key=lambda n: (dsat[n], degre[n]))
             
-            # On trouve le critère choisi du noeud sélectionné
-            critere_choisi = critere_du_noeud[noeud_choisi]
+                # On trouve le critère choisi du noeud sélectionné
+                critere_choisi = critere_du_noeud[noeud_choisi]
             
-            # On cherche les couleurs possibles pour le critère en évitant les couleurs adjacentes
-            # car 2 criteres adjacent ne peuvent avoir la meme couleur
-            couleurs_possibles = set(coloriage.keys())
-            couleurs_possibles.difference_update(couleurs_adjacentes[critere_choisi])
-
-            # On choisit une couleur aléatoire pour le critere parmi les possibles
-            if couleurs_possibles:
-                couleur = np.random.choice(list(couleurs_possibles)) # Conversion en liste pour random
-            # Sinon on prend la couleur suivante du coloriage
-            else:
-                couleur = len(coloriage)
-
-            # On ajoute la couleur au coloriage si elle n'y est pas et on y associe le critère
-            if couleur not in coloriage:
-                coloriage[couleur] = set()
-            coloriage[couleur].add(critere_choisi)
-
-            # On met à jour les DSAT uniquement pour les voisins affectés
-            # Autrement dit si la couleur est nouvelle pour le voisin
-            for voisin_du_critere in voisins_partition[critere_choisi]:
-                if voisin_du_critere in non_colorie:
-                    # On retrouve le critere du voisin
-                    critere_du_voisin = critere_du_noeud[voisin_du_critere]
-
-                    # On ajoute la couleur aux couleurs_adjacentes du critere_du_voisin
-                    couleurs_adjacentes[critere_du_voisin].add(couleur)
-                    
-                    # On met à jour le dsat du voisin du critère
-                    dsat[voisin_du_critere] = len(couleurs_adjacentes[critere_du_voisin])
-
-            # On retire tous les noeuds de ce critère de non_colorie
-            non_colorie.difference_update(partition[critere_choisi])
-
-        # On va maintenant attribuer les couleurs générées à chaque clé de notre coloriage
-        liste_couleurs = generateur_couleur(len(coloriage))
-        dico_couleurs = dict(enumerate(liste_couleurs))
+                # On cherche les couleurs possibles pour le critère en évitant les couleurs adjacentes
+                # car 2 criteres adjacent ne peuvent avoir la meme couleur (les couleurs utilisées sont 0 à k-1)
+                couleurs_possibles = ((1 << len(coloriage)) - 1) & ~couleurs_adjacentes[critere_choisi]
 
-        # On transforme les np.array en tuple pour qu'ils soient hashables et les mettre en clé
-        dico_couleurs_tuple = {key : tuple(arr) for key, arr in dico_couleurs.items()}
+                if couleurs_possibles:
+                    if self.aleatoire:
+                        # On choisit une couleur aléatoire parmi les possibles : on enlève les r plus petits bits à 1
+                        for _ in range(np.random.randint(couleurs_possibles.bit_count())):
+                            couleurs_possibles &= couleurs_possibles - 1
+                    # Numéro du plus petit bit à 1
+                    couleur = (couleurs_possibles & -couleurs_possibles).bit_length() - 1
+                # Sinon on prend la couleur suivante du coloriage
+                else:
+                    couleur = len(coloriage)
 
-        # On obtient le dictionnaire avec clé = couleur RGB et valeur = ensemble des noeuds de cette couleur
-        coloriage_final = {couleur_rgb : coloriage[numero] for numero, couleur_rgb in dico_couleurs_tuple.items()}
+                # On ajoute la couleur au coloriage si elle n'y est pas et on y associe le critère
+                if couleur not in coloriage:
+                    coloriage[couleur] = set()
+                coloriage[couleur].add(critere_choisi)
 
-        return coloriage_final
+                # On met à jour les DSAT uniquement pour les voisins affectés
+                # Autrement dit si la couleur est nouvelle pour le voisin
+                for voisin_du_critere in voisins_partition[critere_choisi]:
+                    if voisin_du_critere in non_colorie:
+                        # On retrouve le critere du voisin
+                        critere_du_voisin = critere_du_noeud[voisin_du_critere]
+
+                        # On ajoute la couleur aux couleurs_adjacentes du critere_du_voisin
+                        couleurs_adjacentes[critere_du_voisin] |= 1 << couleur
+
+                        # On met à jour le dsat du voisin du critère
+                        dsat[voisin_du_critere] = couleurs_adjacentes[critere_du_voisin].bit_count()
 
+                # On retire tous les noeuds de ce critère de non_colorie
+                non_colorie.difference_update(partition[critere_choisi])
 
+        return coloriage
+
+
+def reutiliser_couleurs(ancien : dict[tuple[float, float, float], set[str]],
+                        nouveau : dict[tuple[float, float, float], set[str]]
+                        ) -> dict[tuple[float, float, float], set[str]]:
+    """
+    Reprend autant que possible les couleurs RGB de l'ancien coloriage dans le nouveau, pour que les valeurs du critère
+    qui restent affichées gardent leur couleur (par exemple quand la fenêtre de temps se déplace).
+    Chaque couleur du nouveau coloriage prend l'ancienne couleur la plus fréquente parmi ses valeurs, en commençant par
+    les plus grands recouvrements et sans donner deux fois la même ancienne couleur : le coloriage reste donc valide.
+
+    :param ancien: Coloriage précédent, couleur RGB en clé.
+    :param nouveau: Nouveau coloriage, couleur RGB en clé.
+    :return: Le nouveau coloriage avec les couleurs de l'ancien quand c'est possible.
+    :rtype: dict[tuple[float, float, float], set[str]]
+    """
+    couleur_precedente = {}
+    for couleur, criteres in ancien.items():
+        for c in criteres:
+            couleur_precedente[c] = couleur
+
+    # (nombre de valeurs en commun, nouvelle couleur, ancienne couleur)
+    recouvrements = []
+    for couleur, criteres in nouveau.items():
+        compte = Counter(couleur_precedente[c] for c in criteres if c in couleur_precedente)
+        recouvrements.extend((nombre, couleur, ancienne) for ancienne, nombre in compte.items())
+    recouvrements.sort(key=lambda recouvrement: recouvrement[0], reverse=True)
+
+    remplacement = {}
+    anciennes_prises = set()
+    for _, couleur, ancienne in recouvrements:
+        if couleur not in remplacement and ancienne not in anciennes_prises:
+            remplacement[couleur] = ancienne
+            anciennes_prises.add(ancienne)
+
+    return {remplacement.get(couleur, couleur): criteres for couleur, criteres in nouveau.items()}
+
+
+@profileur.chronometre("ecriture_fichier")
 def ecritureFichierColoriage(coloriage : dict[tuple[float, float, float] : set[str]], 
                              chemin_donnees : str, 
-                             choix_critere : str
+                             choix_critere : str,
+                             chemin_resultat : str = "ressources/Resultats_planification.txt"
                              ):
     """
     :param coloriage: un dico avec la couleur en clé et la liste des criteres à colorier avec cette couleur.
     :param choix_critere: une string correspondant au critère selectionné
-    :param chemin_donnees: une string correspondant au chemin du jeu de données utilisé
+    :param chemin_donnees: une string correspondant au chemin du jeu de données utilisé, ou directement le planning
+    en mémoire (DataFrame renvoyé par generateur_tabulaire) pour ne pas relire de fichier
+    :param chemin_resultat: une string correspondant au chemin du fichier résultat
     :return: None. Créer une copie du fichier d'entrée et ajoute une colonne donnant la couleur associée à chaque case 
     du tableau.
     """
@@ -145,10 +319,18 @@ def ecritureFichierColoriage(coloriage : dict[tuple[float, float, float] : set[s
         for c in criteres:
             couleur_par_critere[c] = couleur
 
+    if not isinstance(chemin_donnees, (str, Path)):
+        # Planning en mémoire : même contenu que la copie ligne à ligne du fichier ci-dessous
+        donnees = chemin_donnees
+        donnees.assign(
+            couleur=[str(couleur_par_critere.get(str(c), "")) for c in donnees[choix_critere]]
+        ).to_csv(chemin_resultat, index=False, sep=";")
+        return
+
     # Lecture et ecriture du fichier
     
     with open(chemin_donnees, "r", encoding="utf-8") as f_in, \
-         open("ressources/Resultats_planification.txt", "w", encoding="utf-8") as f_out:
+         open(chemin_resultat, "w", encoding="utf-8") as f_out:
 
         # Header du fichier
         header = f_in.readline().rstrip("\n")
@@ -171,7 +353,120 @@ def ecritureFichierColoriage(coloriage : dict[tuple[float, float, float] : set[s
             couleur = couleur_par_critere.get(str(critere), "")  # vide si pas trouve
 
             f_out.write(line + ";" + str(couleur) + "\n")
-    
+
+
+@profileur.chronometre("ecriture_fichier")
+def ecritureFichierColonnes(coloriage : dict[tuple[float, float, float] : set[str]],
+                            chemin_donnees : str,
+                            choix_critere : str,
+                            chemin_sortie : str = "ressources/Resultats_planification"
+                            ) -> Path:
+    """
+    Equivalent binaire et colonnaire de ecritureFichierColoriage : le plan est écrit avec un numéro de couleur entier
+    par opération, la palette (numéro -> RGB) et le critère utilisé. On écrit un .parquet si pyarrow est installé,
+    sinon un dossier de fichiers .npy (un par colonne) que np.load(mmap_mode="r") peut projeter en mémoire.
+    Dans le dossier .npy, les colonnes de texte sont encodées par dictionnaire : <colonne>.npy contient des codes
+    entiers et <colonne>.categories.npy les valeurs distinctes.
+
+    :param coloriage: un dico avec la couleur en clé et la liste des criteres à colorier avec cette couleur.
+    :param chemin_donnees: une string correspondant au chemin du jeu de données utilisé, ou le planning en mémoire
+    :param choix_critere: une string correspondant au critère selectionné
+    :param chemin_sortie: chemin du fichier de sortie sans extension, .parquet ou dossier .npy suivant le format utilisé
+    :return: Le chemin du fichier ou du dossier écrit
+    :rtype: Path
+    """
+    import pandas as pd
+
+    # Palette : le numéro de couleur est l'ordre des clés du coloriage
+    palette = np.array([tuple(map(float, couleur)) for couleur in coloriage.keys()], dtype=np.float64).reshape(-1, 3)
+    numero_par_critere = {}
+    for numero, criteres in enumerate(coloriage.values()):
+        for c in criteres:
+            numero_par_critere[str(c)] = numero
+
+    if isinstance(chemin_donnees, (str, Path)):
+        data = pd.read_csv(chemin_donnees, dtype=str, sep=";")
+    else:
+        data = chemin_donnees.copy()
+    data["dtedeb"] = pd.to_datetime(data["dtedeb"])
+    data["dtefin"] = pd.to_datetime(data["dtefin"])
+    # -1 si la valeur du critère n'a pas de couleur
+    data["couleur"] = data[choix_critere].map(numero_par_critere).fillna(-1).astype(np.int32)
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        pa = None
+
+    if pa is not None:
+        chemin = Path(chemin_sortie).with_suffix(".parquet")
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[b"critere"] = choix_critere.encode()
+        metadata[b"palette"] = json.dumps(palette.tolist()).encode()
+        pq.write_table(table.replace_schema_metadata(metadata), chemin)
+    else:
+        chemin = Path(chemin_sortie)
+        chemin.mkdir(parents=True, exist_ok=True)
+        types = {}
+        for nom in data.columns:
+            if nom in ("dtedeb", "dtefin"):
+                np.save(chemin / f"{nom}.npy", data[nom].to_numpy(dtype="datetime64[ms]"))
+                types[nom] = "date"
+            elif nom == "couleur":
+                # Type signé même avec une palette vide, pour garder -1 (pas de couleur)
+                type_couleur = np.min_scalar_type(-max(len(palette), 1))
+                np.save(chemin / f"{nom}.npy", data[nom].to_numpy().astype(type_couleur))
+                types[nom] = "entier"
+            else:
+                # Encodage par dictionnaire : peu de valeurs distinctes par colonne (centres, OF, opérations...)
+                codes, categories = pd.factorize(data[nom].astype(str))
+                np.save(chemin / f"{nom}.npy", codes.astype(np.min_scalar_type(max(len(categories) - 1, 0))))
+                np.save(chemin / f"{nom}.categories.npy", np.asarray(categories, dtype=str))
+                types[nom] = "categorie"
+        np.save(chemin / "palette.npy", palette)
+        with open(chemin / "meta.json", "w", encoding="utf-8") as f:
+            json.dump({"critere": choix_critere, "colonnes": types}, f)
+    return chemin
+
+
+def lectureFichierColonnes(chemin : str,
+                           decoder : bool = True
+                           ) -> tuple[dict[str, np.ndarray], np.ndarray, str]:
+    """
+    Relit un fichier écrit par ecritureFichierColonnes, les colonnes sont projetées en mémoire (memory-map).
+
+    :param chemin: chemin du fichier .parquet ou du dossier .npy
+    :param decoder: si True, les colonnes de texte du dossier .npy sont décodées (ce qui les charge en mémoire) ;
+    sinon chaque colonne de texte <nom> reste en codes entiers et ses valeurs sont dans <nom>.categories
+    :return: Les colonnes du plan, la palette (n, 3) et le critère
+    :rtype: tuple[dict[str, np.ndarray], np.ndarray, str]
+    """
+    chemin = Path(chemin)
+    if chemin.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(chemin, memory_map=True)
+        metadata = table.schema.metadata
+        palette = np.array(json.loads(metadata[b"palette"]), dtype=np.float64).reshape(-1, 3)
+        colonnes = {nom: table.column(nom).to_numpy() for nom in table.column_names}
+        return colonnes, palette, metadata[b"critere"].decode()
+
+    with open(chemin / "meta.json", encoding="utf-8") as f:
+        meta = json.load(f)
+    colonnes = {}
+    for nom, type_colonne in meta["colonnes"].items():
+        colonnes[nom] = np.load(chemin / f"{nom}.npy", mmap_mode="r")
+        if type_colonne == "categorie":
+            categories = np.load(chemin / f"{nom}.categories.npy")
+            if decoder:
+                colonnes[nom] = categories[colonnes[nom]]
+            else:
+                colonnes[f"{nom}.categories"] = categories
+    return colonnes, np.load(chemin / "palette.npy"), meta["critere"]
+
+
 if __name__=="__main__":
     from datetime import datetime, timedelta
     import pandas as pd
@@ -204,4 +499,6 @@ if __name__=="__main__":
     algo_dsat = DSATUR()
     coloriage = algo_dsat.trouver_coloriage(liste_noeuds=liste_noeuds, critere="codof")
     print(f"Le coloriage est : {coloriage}")
-    ecritureFichierColoriage(coloriage, "ressources/Planification.txt", "codof")
\ No newline at end of file
+    ecritureFichierColoriage(coloriage, "ressources/Planification.txt", "codof")
+    chemin = ecritureFichierColonnes(coloriage, "ressources/Planification.txt", "codof")
+    print(f"Export colonnaire : {chemin}")
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""
+Borne inférieure du nombre de couleurs pour un critère : on cherche une grande clique dans le graphe quotient
+(une valeur du critère par sommet, deux valeurs reliées si deux de leurs noeuds sont voisins).
+Toute clique demande autant de couleurs que de sommets, donc aucun coloriage ne peut faire mieux que la borne et
+un algorithme qui l'atteint peut s'arrêter.
+La borne est la clique trouvée par une heuristique gloutonne. Un balayage du temps ne suffit pas : après
+generateur_tabulaire les opérations d'une ligne ne se chevauchent jamais, il ne verrait donc jamais plus de
+max_machine_gap + 1 opérations simultanées alors que max_time_gap relie des opérations éloignées dans le temps.
+"""
+
+from datetime import timedelta
+from typing import List
+
+from core.Noeud import Noeud
+from core.Profilage import profileur
+
+
+def borne_clique_gloutonne(
+        partition: dict[str, set[Noeud]],
+        voisins: dict[Noeud, set[Noeud]],
+        nb_departs: int = 20
+        ) -> int:
+    """
+    Heuristique gloutonne de clique sur le graphe quotient : à partir des valeurs de plus grand degré, on ajoute à
+    chaque étape le candidat (voisin de toute la clique) qui a le plus de voisins.
+
+    :param partition: Partition des noeuds selon le critère (voir Noeud.partition).
+    :type partition: dict[str, set[Noeud]]
+    :param voisins: Dictionnaire des voisins de chaque noeud.
+    :type voisins: dict[Noeud, set[Noeud]]
+    :param nb_departs: Nombre de valeurs de départ essayées.
+    :type nb_departs: int
+    :return: Taille de la plus grande clique trouvée
+    :rtype: int
+    """
+    # Les valeurs sont numérotées et l'adjacence de chaque valeur est un masque de bits : les intersections sont des
+    # & entre entiers. Les noeuds sont repérés par id() pour ne pas recalculer le hash du dataclass à chaque arête.
+    numero_du_noeud = {}
+    for numero, noeuds in enumerate(partition.values()):
+        for noeud in noeuds:
+            numero_du_noeud[id(noeud)] = numero
+    adjacence = []
+    for numero, noeuds in enumerate(partition.values()):
+        adjacents = {numero_du_noeud[id(voisin)] for noeud in noeuds for voisin in voisins[noeud]}
+        adjacents.discard(numero)
+        masque = 0
+        for autre in adjacents:
+            masque |= 1 << autre
+        adjacence.append(masque)
+
+    meilleure = 1 if partition else 0
+    departs = sorted(range(len(adjacence)), key=lambda numero: adjacence[numero].bit_count(), reverse=True)
+    for depart in departs[:nb_departs]:
+        taille = 1
+        candidats = adjacence[depart]
+        while candidats:
+            # Candidat qui a le plus de voisins parmi les candidats
+            restants = candidats
+            meilleur_score = -1
+            while restants:
+                bit = restants & -restants
+                restants ^= bit
+                numero = bit.bit_length() - 1
+                score = (adjacence[numero] & candidats).bit_count()
+                if score > meilleur_score:
+                    meilleur_score, choisi = score, numero
+            taille += 1
+            candidats &= adjacence[choisi]
+        meilleure = max(meilleure, taille)
+    return meilleure
+
+
+def borne_inferieure(
+        liste_noeuds: List[Noeud],
+        critere: str,
+        voisins: dict[Noeud, set[Noeud]] | None = None,
+        max_machine_gap: int = 2,
+        max_time_gap: timedelta = timedelta(days=21),
+        ) -> int:
+    """
+    Renvoie une borne inférieure du nombre de couleurs nécessaires pour colorier le critère.
+
+    :param liste_noeuds: Liste des noeuds.
+    :type liste_noeuds: List[Noeud]
+    :param critere: Critère du coloriage.
+    :type critere: str
+    :param voisins: Graphe des voisins déjà calculé, s'il vaut None il est calculé avec Noeud.voisins_noeud
+    :type voisins: dict[Noeud, set[Noeud]] | None
+    :param max_machine_gap: Ecart maximale en terme d'indice dans la liste de machines pour être considéré voisin.
+    :type max_machine_gap: int
+    :param max_time_gap: Ecart maximale en terme de temps pour être considéré voisin.
+    :type max_time_gap: timedelta
+    :return: Taille de la clique trouvée par borne_clique_gloutonne
+    :rtype: int
+    """
+    if voisins is None:
+        voisins = Noeud.voisins_noeud(liste_noeuds, max_machine_gap, max_time_gap)
+    with profileur.mesure("borne_inferieure"):
+        partition = Noeud.partition(liste_noeuds, critere=critere)
+        borne = borne_clique_gloutonne(partition, voisins)
+    profileur.compteur("borne_inferieure", borne)
+    return borne
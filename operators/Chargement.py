@@ -0,0 +1,168 @@
+"""
+Fichier regroupant la construction des Noeuds, à partir du planning découpé par generateur_tabulaire (en mémoire) ou
+des fichiers Planification_modifiee et Machine_modifie.
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from core.Noeud import Noeud
+from core.Profilage import profileur
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@profileur.chronometre("chargement_noeuds")
+def noeuds_depuis_donnees(
+        data: "pd.DataFrame",
+        mapping_machines: dict[str, int],
+        debut: datetime | None = None,
+        fin: datetime | None = None,
+        marge: timedelta = timedelta(0),
+        ) -> list[Noeud]:
+    """
+    Construit la liste des noeuds à partir du planning découpé, l'indice de chaque ligne du planning devient id_noeud.
+    Si debut ou fin est donné, on ne garde que les opérations qui rencontrent [debut - marge, fin + marge].
+    Avec marge = max_time_gap, les voisins des opérations de la fenêtre sont aussi chargés.
+
+    :param data: Planning découpé (voir generateur_tabulaire), les dates peuvent être des dates ou du texte.
+    :type data: pd.DataFrame
+    :param mapping_machines: Dictionnaire qui associe chaque centre à son indice (sa ligne dans le diagramme).
+    :type mapping_machines: dict[str, int]
+    :param debut: Début de la fenêtre, None pour ne pas filtrer le début.
+    :type debut: datetime | None
+    :param fin: Fin de la fenêtre, None pour ne pas filtrer la fin.
+    :type fin: datetime | None
+    :param marge: Marge ajoutée de chaque côté de la fenêtre.
+    :type marge: timedelta
+    :return: La liste des noeuds
+    :rtype: list[Noeud]
+    """
+    import pandas as pd  # Import local : pandas est long à importer et n'est utile qu'au chargement
+    dates_debut = pd.to_datetime(data["dtedeb"])
+    dates_fin = pd.to_datetime(data["dtefin"])
+    garder = pd.Series(True, index=data.index)
+    if debut is not None:
+        garder &= dates_fin >= debut - marge
+    if fin is not None:
+        garder &= dates_debut <= fin + marge
+    data = data[garder]
+    # Les colonnes sont parcourues ensemble, beaucoup plus rapide que iterrows
+    return [
+        Noeud(
+            i,
+            mapping_machines[centre],
+            centre,
+            codprod,
+            codof,
+            sequence,
+            codop,
+            date_debut,
+            date_fin,
+        )
+        for i, centre, codprod, codof, sequence, codop, date_debut, date_fin in zip(
+            data.index,
+            data["centre"],
+            data["codprod"],
+            data["codof"],
+            data["sequence"],
+            data["codop"],
+            dates_debut[garder].dt.to_pydatetime(),
+            dates_fin[garder].dt.to_pydatetime(),
+        )
+    ]
+
+
+def donnees_depuis_noeuds(liste_noeuds: list[Noeud]) -> "pd.DataFrame":
+    """
+    Inverse de noeuds_depuis_donnees : reconstruit le planning découpé (mêmes colonnes que celui renvoyé par
+    generateur_tabulaire) à partir des noeuds, id_noeud redevient l'indice de la ligne.
+
+    :param liste_noeuds: Liste des noeuds, dans l'ordre du planning.
+    :type liste_noeuds: list[Noeud]
+    :return: Le planning découpé
+    :rtype: pd.DataFrame
+    """
+    import pandas as pd  # Import local : pandas est long à importer et n'est utile qu'au chargement
+    return pd.DataFrame(
+        {
+            "centre": [noeud.centre for noeud in liste_noeuds],
+            "codprod": [noeud.codprod for noeud in liste_noeuds],
+            "codof": [noeud.codof for noeud in liste_noeuds],
+            "sequence": [noeud.sequence for noeud in liste_noeuds],
+            "codop": [noeud.codop for noeud in liste_noeuds],
+            "dtedeb": pd.to_datetime([noeud.date_debut for noeud in liste_noeuds]),
+            "dtefin": pd.to_datetime([noeud.date_fin for noeud in liste_noeuds]),
+        },
+        index=[noeud.id_noeud for noeud in liste_noeuds],
+    )
+
+
+def charger_noeuds(
+        chemin_data: Path,
+        chemin_machines: Path,
+        debut: datetime | None = None,
+        fin: datetime | None = None,
+        marge: timedelta = timedelta(0),
+        ) -> tuple[list[Noeud], dict[str, int]]:
+    """
+    Lit les fichiers écrits par generateur_tabulaire et construit la liste des noeuds (voir noeuds_depuis_donnees).
+
+    :param chemin_data: Chemin du fichier Planification_modifiee.
+    :type chemin_data: Path
+    :param chemin_machines: Chemin du fichier Machine_modifie.
+    :type chemin_machines: Path
+    :param debut: Début de la fenêtre, None pour ne pas filtrer le début.
+    :type debut: datetime | None
+    :param fin: Fin de la fenêtre, None pour ne pas filtrer la fin.
+    :type fin: datetime | None
+    :param marge: Marge ajoutée de chaque côté de la fenêtre.
+    :type marge: timedelta
+    :return: La liste des noeuds et le dictionnaire qui associe chaque centre à son indice (sa ligne dans le diagramme)
+    :rtype: tuple[list[Noeud], dict[str, int]]
+    """
+    import pandas as pd  # Import local : pandas est long à importer et n'est utile qu'au chargement
+    with profileur.mesure("lecture_fichiers"):
+        data = pd.read_csv(chemin_data, dtype=str, sep=";")
+        machines = pd.read_csv(chemin_machines)
+    mapping_machines = {machines["centre"][i]: i for i in range(len(machines))}
+    return noeuds_depuis_donnees(data, mapping_machines, debut, fin, marge), mapping_machines
+
+
+def charger_planification(
+        chemin_data: Path,
+        chemin_machines: Path,
+        debut: datetime | None = None,
+        fin: datetime | None = None,
+        marge: timedelta = timedelta(0),
+        dossier_sortie: Path | None = None,
+        ecrire_fichiers: bool = False,
+        ) -> tuple[list[Noeud], dict[str, int], "pd.DataFrame"]:
+    """
+    Pipeline complet en mémoire : découpage en lignes (generateur_tabulaire) puis construction des noeuds, sans
+    écrire ni relire Planification_modifiee et Machine_modifie (sauf si ecrire_fichiers).
+
+    :param chemin_data: Chemin du fichier Planification.
+    :type chemin_data: Path
+    :param chemin_machines: Chemin du fichier Machine.
+    :type chemin_machines: Path
+    :param debut: Début de la fenêtre, None pour ne pas filtrer le début.
+    :type debut: datetime | None
+    :param fin: Fin de la fenêtre, None pour ne pas filtrer la fin.
+    :type fin: datetime | None
+    :param marge: Marge ajoutée de chaque côté de la fenêtre.
+    :type marge: timedelta
+    :param dossier_sortie: Dossier des fichiers modifiés s'ils sont écrits (voir generateur_tabulaire).
+    :type dossier_sortie: Path | None
+    :param ecrire_fichiers: Si True, écrit aussi Planification_modifiee et Machine_modifie.
+    :type ecrire_fichiers: bool
+    :return: La liste des noeuds, le dictionnaire qui associe chaque centre à sa ligne et le planning découpé (à
+        passer à ecritureFichierColoriage pour ne pas relire de fichier)
+    :rtype: tuple[list[Noeud], dict[str, int], pd.DataFrame]
+    """
+    from operators.GenerateurTabulaire import generateur_tabulaire
+
+    data, mapping_machines = generateur_tabulaire(chemin_data, chemin_machines, dossier_sortie, ecrire_fichiers)
+    return noeuds_depuis_donnees(data, mapping_machines, debut, fin, marge), mapping_machines, data
@@ -0,0 +1,129 @@
+"""
+Coloriage par composantes connexes : avec les écarts maximum de Noeud.est_voisin, un grand planning se découpe
+souvent en groupes indépendants (machines éloignées, périodes creuses). Chaque composante connexe du graphe des
+valeurs du critère est coloriée séparément dans un processus, puis les numéros de couleur sont réutilisés d'une
+composante à l'autre : le nombre total de couleurs est celui de la composante qui en demande le plus.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+import os
+
+from core.Noeud import Noeud
+from core.Profilage import profileur
+from operators.AlgorithmeColoriage import AlgorithmeColoriage, DSATUR
+
+
+def composantes_connexes(
+        partition: dict[str, set[Noeud]],
+        voisins: dict[Noeud, set[Noeud]]
+        ) -> list[set[str]]:
+    """
+    Renvoie les composantes connexes du graphe quotient : deux valeurs du critère sont reliées si un de leurs noeuds
+    sont voisins.
+
+    :param partition: Partition des noeuds selon le critère (voir Noeud.partition).
+    :type partition: dict[str, set[Noeud]]
+    :param voisins: Dictionnaire des voisins de chaque noeud.
+    :type voisins: dict[Noeud, set[Noeud]]
+    :return: Liste des composantes, chacune étant l'ensemble des valeurs du critère qui la composent
+    :rtype: list[set[str]]
+    """
+    critere_du_noeud = {}
+    for valeur, noeuds in partition.items():
+        for noeud in noeuds:
+            critere_du_noeud[noeud] = valeur
+
+    composantes = []
+    deja_vu = set()
+    for depart in partition.keys():
+        if depart in deja_vu:
+            continue
+        # Parcours en profondeur à partir de la valeur de départ
+        composante = {depart}
+        deja_vu.add(depart)
+        a_visiter = [depart]
+        while a_visiter:
+            valeur = a_visiter.pop()
+            for noeud in partition[valeur]:
+                for voisin in voisins[noeud]:
+                    valeur_voisin = critere_du_noeud[voisin]
+                    if valeur_voisin not in deja_vu:
+                        deja_vu.add(valeur_voisin)
+                        composante.add(valeur_voisin)
+                        a_visiter.append(valeur_voisin)
+        composantes.append(composante)
+    return composantes
+
+
+def _colorier_lot(
+        algo: AlgorithmeColoriage,
+        lot: list[tuple[list[Noeud], dict[Noeud, set[Noeud]]]],
+        critere: str
+        ) -> list[dict[int, set[str]]]:
+    """
+    Colorie (en numéros de couleur) chaque composante d'un lot, exécuté dans un processus du pool.
+    """
+    return [algo.trouver_coloriage_indices(noeuds, critere, voisins) for noeuds, voisins in lot]
+
+
+class ColoriageParComposantes(AlgorithmeColoriage):
+    """
+    Classe héritée de la classe abstraite "AlgorithmeColoriage" qui découpe le graphe en composantes connexes et
+    colorie chacune d'elles avec un autre algorithme, en parallèle sur plusieurs processus.
+    Atttributs :
+        -algo (AlgorithmeColoriage) : Algorithme utilisé sur chaque composante.
+        -max_workers (int | None) : Nombre de processus, par défaut le nombre de coeurs.
+    """
+
+    def __init__(
+        self,
+        algo: AlgorithmeColoriage | None = None,
+        max_workers: int | None = None,
+    ):
+        self.algo = algo if algo is not None else DSATUR()
+        super().__init__(self.algo.max_machine_gap, self.algo.max_time_gap, self.algo.taille_shard)
+        self.max_workers = max_workers if max_workers is not None else os.cpu_count()
+
+    def trouver_coloriage_indices(
+            self,
+            liste_noeuds: List[Noeud],
+            critere: str,
+            voisins: dict[Noeud, set[Noeud]] | None = None,
+            ) -> dict[int, set[str]]:
+        if voisins is None:
+            voisins = self.voisins(liste_noeuds)
+        partition = Noeud.partition(liste_noeuds, critere=critere)
+        with profileur.mesure("composantes_connexes"):
+            composantes = composantes_connexes(partition, voisins)
+        profileur.compteur("composantes", len(composantes))
+
+        # Chaque composante est transmise avec son sous-graphe (les voisins d'un noeud sont dans sa composante)
+        taches = []
+        for composante in composantes:
+            noeuds = [noeud for valeur in composante for noeud in partition[valeur]]
+            taches.append((noeuds, {noeud: voisins[noeud] for noeud in noeuds}))
+
+        nb_lots = min(self.max_workers, len(taches))
+        if nb_lots <= 1:
+            resultats = _colorier_lot(self.algo, taches, critere)
+        else:
+            # On répartit les composantes de la plus grande à la plus petite dans le lot le moins chargé
+            # pour équilibrer le travail entre les processus
+            lots = [[] for _ in range(nb_lots)]
+            charges = [0] * nb_lots
+            for tache in sorted(taches, key=lambda t: len(t[0]), reverse=True):
+                i = charges.index(min(charges))
+                lots[i].append(tache)
+                charges[i] += len(tache[0])
+            with ProcessPoolExecutor(max_workers=nb_lots) as executor:
+                futures = [executor.submit(_colorier_lot, self.algo, lot, critere) for lot in lots]
+                resultats = [coloriage for future in futures for coloriage in future.result()]
+
+        # Fusion : la couleur numéro i d'une composante est la couleur numéro i du coloriage final
+        # (deux composantes différentes n'ont aucune arête entre elles)
+        coloriage = {}
+        for coloriage_composante in resultats:
+            for numero, valeurs in coloriage_composante.items():
+                coloriage.setdefault(int(numero), set()).update(valeurs)
+        return coloriage
@@ -8,8 +8,6 @@ On obtient pour 50 couleurs environ 9.3 ce qui est très bien
 """
 
 import numpy as np
-import basic_colormath
-import tkinter as tk
 from typing import Annotated
 from numpy.typing import NDArray
 
@@ -22,6 +20,7 @@ def generateur_rgb(
         n: int
         ) -> RGBArray:
     """Génère n couleurs RGB"""
+    import basic_colormath  # Import local : uniquement utile quand on génère une palette
 
     # On génère n couleurs en HSL pour avoir des couleurs optimales
     hues = np.linspace(0, 365, n, endpoint=False) % 365 # Uniformité en teinte sur le disque
@@ -36,6 +35,7 @@ def maximin_delta_e2000(
         n: int
         ) -> RGBArray:
     """Sélectionne n couleurs maximisant la distance Delta E 2000"""
+    import basic_colormath
     
     # On choisit une première couleur aléatoire
     first_idx = np.random.randint(0, len(candidats))
@@ -71,6 +71,8 @@ def maximin_delta_e2000(
     return couleurs_choisies
 
 def evaluer(selection : RGBArray):
+    import basic_colormath
+
     distances = basic_colormath.get_delta_e_matrix(selection, selection)
     np.fill_diagonal(distances, np.inf)
     return np.min(distances)
@@ -81,6 +83,8 @@ def generateur_couleur(n : int):
     return maximin_delta_e2000(candidats, n)
 
 def show_colors(rgb_tuples):
+    import tkinter as tk  # Import local pour pouvoir générer des couleurs sans affichage
+
     root = tk.Tk()
     root.title("Visualisation couleurs")
     frame = tk.Frame(root)
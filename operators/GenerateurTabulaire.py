@@ -1,17 +1,43 @@
 from pathlib import Path
-import pandas as pd
+from typing import TYPE_CHECKING
 
+from core.Profilage import profileur
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@profileur.chronometre("decoupage_lignes")
 def generateur_tabulaire(
         chemin_data: Path, 
-        chemin_machines: Path
-        ):
+        chemin_machines: Path,
+        dossier_sortie: Path | None = None,
+        ecrire_fichiers: bool = True,
+        ) -> tuple["pd.DataFrame", dict[str, int]]:
+    """
+    Sépare chaque machine en autant de lignes (sous-machines) que nécessaire pour qu'aucune opération ne se chevauche
+    sur une même ligne. Le résultat est renvoyé en mémoire (voir Chargement.noeuds_depuis_donnees) et n'est écrit
+    dans Planification_modifiee.txt et Machine_modifie.txt que si ecrire_fichiers.
+
+    :param chemin_data: Chemin du fichier Planification.
+    :type chemin_data: Path
+    :param chemin_machines: Chemin du fichier Machine.
+    :type chemin_machines: Path
+    :param dossier_sortie: Dossier où écrire les fichiers modifiés, par défaut à côté des fichiers d'entrée.
+    :type dossier_sortie: Path | None
+    :param ecrire_fichiers: Si True, écrit aussi Planification_modifiee.txt et Machine_modifie.txt.
+    :type ecrire_fichiers: bool
+    :return: Le planning découpé (dtedeb et dtefin converties en dates) et le dictionnaire qui associe chaque centre,
+        sous-machines comprises, à sa ligne dans le diagramme
+    :rtype: tuple[pd.DataFrame, dict[str, int]]
+    """
+    import pandas as pd  # Import local : pandas est long à importer et n'est utile qu'au chargement
     data = pd.read_csv(chemin_data, dtype=str, sep=";")
     data["dtedeb"] = pd.to_datetime(data["dtedeb"])
     data["dtefin"] = pd.to_datetime(data["dtefin"])
     machines = pd.read_csv(chemin_machines, sep=";")
-    new_data_path = chemin_data.parent / "Planification_modifiee.txt"
-    new_machine_path = chemin_machines.parent / "Machine_modifie.txt"
+    new_data_path = (dossier_sortie or chemin_data.parent) / "Planification_modifiee.txt"
+    new_machine_path = (dossier_sortie or chemin_machines.parent) / "Machine_modifie.txt"
 
     for machine, operations in data.groupby("centre"):
         ops = operations.sort_values("dtedeb")
@@ -55,9 +81,12 @@ def generateur_tabulaire(
             for operation_idx in groups[num]:
                 data.loc[operation_idx, "centre"] = f"{machine}_{num}"
 
-    # On retransforme en .txt
-    data.to_csv(new_data_path, index=False, sep=";")
-    machines.to_csv(new_machine_path, index=False)
+    if ecrire_fichiers:
+        # On retransforme en .txt
+        data.to_csv(new_data_path, index=False, sep=";")
+        machines.to_csv(new_machine_path, index=False)
+    mapping_machines = {centre: i for i, centre in enumerate(machines["centre"])}
+    return data, mapping_machines
 
 
 if __name__ == "__main__":
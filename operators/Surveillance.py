@@ -0,0 +1,282 @@
+"""
+Mode surveillance : le fichier Planification est réécrit régulièrement par l'ordonnanceur. On le relit quand il
+change et on compare les nouvelles opérations aux noeuds déjà chargés avec la clé (codof, sequence, codop).
+Seules les opérations ajoutées, supprimées ou modifiées sont appliquées au graphe des voisins et au coloriage.
+"""
+
+from datetime import timedelta
+from pathlib import Path
+import hashlib
+import os
+
+from core.Noeud import Noeud
+from core.Profilage import profileur
+
+
+class SurveillanceFichier:
+    """
+    Détecte les modifications d'un fichier : on compare d'abord la date de modification et la taille (un simple
+    os.stat), puis l'empreinte du contenu pour ignorer les réécritures à l'identique.
+    Atttributs :
+        -chemin (Path) : Fichier surveillé.
+        -signature (tuple[int, int] | None) : Date de modification (ns) et taille lors de la dernière vérification.
+        -empreinte (str | None) : Empreinte blake2b du contenu lors de la dernière modification détectée.
+    """
+
+    def __init__(self, chemin: Path):
+        self.chemin = Path(chemin)
+        self.signature = None
+        self.empreinte = None
+        self.a_change()  # Etat initial
+
+    def a_change(self) -> bool:
+        """
+        Renvoie True si le contenu du fichier a changé depuis le dernier appel.
+
+        :return: True si le contenu a changé, False sinon (ou si le fichier est absent, par exemple en cours d'écriture)
+        :rtype: bool
+        """
+        try:
+            stat = os.stat(self.chemin)
+        except FileNotFoundError:
+            return False
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self.signature:
+            return False
+        self.signature = signature
+        empreinte = hashlib.blake2b(self.chemin.read_bytes()).hexdigest()
+        if empreinte == self.empreinte:
+            return False
+        self.empreinte = empreinte
+        return True
+
+    def oublier(self):
+        """
+        Oublie la date, la taille et l'empreinte enregistrées, à appeler quand le fichier signalé par a_change n'a pas
+        pu être lu (par exemple à moitié écrit) : le prochain appel à a_change renverra True et il sera relu.
+        """
+        self.signature = None
+        self.empreinte = None
+
+
+def cles_noeuds(liste_noeuds: list[Noeud]) -> dict[tuple[str, str, str, int], Noeud]:
+    """
+    Associe à chaque noeud sa clé (codof, sequence, codop, occurrence). L'occurrence distingue les éventuelles
+    opérations qui ont les mêmes codes, dans l'ordre du fichier.
+
+    :param liste_noeuds: Liste des noeuds.
+    :type liste_noeuds: list[Noeud]
+    :return: Dictionnaire avec pour clé la clé du noeud et pour valeur le noeud
+    :rtype: dict[tuple[str, str, str, int], Noeud]
+    """
+    occurrences = {}
+    cles = {}
+    for noeud in liste_noeuds:
+        code = (noeud.codof, noeud.sequence, noeud.codop)
+        occurrences[code] = occurrences.get(code, -1) + 1
+        cles[(*code, occurrences[code])] = noeud
+    return cles
+
+
+def _memes_attributs(noeud1: Noeud, noeud2: Noeud) -> bool:
+    """
+    Compare deux noeuds sans tenir compte de id_noeud (le numéro de ligne change dès qu'une ligne est ajoutée avant).
+    """
+    return (
+        noeud1.indice_machine == noeud2.indice_machine
+        and noeud1.centre == noeud2.centre
+        and noeud1.codprod == noeud2.codprod
+        and noeud1.date_debut == noeud2.date_debut
+        and noeud1.date_fin == noeud2.date_fin
+    )
+
+
+def compare_noeuds(
+        anciens: list[Noeud],
+        nouveaux: list[Noeud]
+        ) -> tuple[list[Noeud], list[Noeud], list[Noeud], list[tuple[Noeud, Noeud]]]:
+    """
+    Compare les noeuds relus aux noeuds déjà chargés.
+    Dans la liste renvoyée, les noeuds inchangés sont les objets déjà chargés : ils restent des clés valides pour le
+    graphe des voisins et le dessin.
+
+    :param anciens: Noeuds déjà chargés.
+    :type anciens: list[Noeud]
+    :param nouveaux: Noeuds lus dans le nouveau fichier.
+    :type nouveaux: list[Noeud]
+    :return: La nouvelle liste de noeuds, les noeuds ajoutés, les noeuds supprimés et les couples (ancien, nouveau)
+        des noeuds modifiés
+    :rtype: tuple[list[Noeud], list[Noeud], list[Noeud], list[tuple[Noeud, Noeud]]]
+    """
+    cles_anciens = cles_noeuds(anciens)
+    cles_nouveaux = cles_noeuds(nouveaux)
+    liste_noeuds = []
+    ajoutes = []
+    modifies = []
+    for cle, noeud in cles_nouveaux.items():
+        ancien = cles_anciens.get(cle)
+        if ancien is None:
+            ajoutes.append(noeud)
+            liste_noeuds.append(noeud)
+        elif _memes_attributs(ancien, noeud):
+            liste_noeuds.append(ancien)
+        else:
+            modifies.append((ancien, noeud))
+            liste_noeuds.append(noeud)
+    supprimes = [noeud for cle, noeud in cles_anciens.items() if cle not in cles_nouveaux]
+    return liste_noeuds, ajoutes, supprimes, modifies
+
+
+def ordre_conserve(anciens: list[Noeud], nouveaux: list[Noeud]) -> bool:
+    """
+    Vérifie que les noeuds présents dans les deux listes (les mêmes objets, voir compare_noeuds) y sont dans le même
+    ordre. Noeud.est_voisin dépend de l'ordre de ses deux noeuds, les arêtes entre noeuds conservés ne restent donc
+    valables (voir maj_voisins) que si cet ordre n'a pas changé.
+
+    :param anciens: Ancienne liste des noeuds.
+    :type anciens: list[Noeud]
+    :param nouveaux: Nouvelle liste des noeuds.
+    :type nouveaux: list[Noeud]
+    :return: True si les noeuds conservés sont dans le même ordre
+    :rtype: bool
+    """
+    ids_anciens = {id(noeud) for noeud in anciens}
+    ids_nouveaux = {id(noeud) for noeud in nouveaux}
+    return (
+        [id(noeud) for noeud in anciens if id(noeud) in ids_nouveaux]
+        == [id(noeud) for noeud in nouveaux if id(noeud) in ids_anciens]
+    )
+
+
+def maj_voisins(
+        voisins: dict[Noeud, set[Noeud]],
+        liste_noeuds: list[Noeud],
+        retires: list[Noeud],
+        ajoutes: list[Noeud],
+        max_machine_gap: int = 2,
+        max_time_gap: timedelta = timedelta(days=21),
+        ):
+    """
+    Met à jour le graphe des voisins sur place : les noeuds retirés sont enlevés avec leurs arêtes, puis chaque noeud
+    ajouté est comparé à tous les noeuds de liste_noeuds (comme dans Noeud.voisins_noeud, est_voisin est appelé avec
+    le noeud qui vient en premier dans la liste).
+    Les arêtes entre noeuds conservés sont gardées : le résultat n'est celui de Noeud.voisins_noeud que si ces noeuds
+    sont restés dans le même ordre (voir ordre_conserve), sinon il faut reconstruire le graphe.
+
+    :param voisins: Graphe des voisins à mettre à jour.
+    :type voisins: dict[Noeud, set[Noeud]]
+    :param liste_noeuds: Nouvelle liste des noeuds (voir compare_noeuds).
+    :type liste_noeuds: list[Noeud]
+    :param retires: Noeuds à enlever du graphe.
+    :type retires: list[Noeud]
+    :param ajoutes: Noeuds à ajouter au graphe, ils doivent être dans liste_noeuds.
+    :type ajoutes: list[Noeud]
+    :param max_machine_gap: Ecart maximale en terme d'indice dans la liste de machines pour être considéré voisin.
+    :type max_machine_gap: int
+    :param max_time_gap: Ecart maximale en terme de temps pour être considéré voisin.
+    :type max_time_gap: timedelta
+    """
+    with profileur.mesure("maj_voisins"):
+        for noeud in retires:
+            for voisin in voisins.pop(noeud, ()):
+                if voisin in voisins:
+                    voisins[voisin].discard(noeud)
+
+        position = {noeud: i for i, noeud in enumerate(liste_noeuds)}
+        for noeud in ajoutes:
+            voisins[noeud] = set()
+        deja_compares = set()
+        for noeud in ajoutes:
+            deja_compares.add(noeud)
+            for autre in liste_noeuds:
+                if autre in deja_compares:
+                    continue
+                if position[noeud] < position[autre]:
+                    est_voisin = noeud.est_voisin(autre, max_machine_gap, max_time_gap)
+                else:
+                    est_voisin = autre.est_voisin(noeud, max_machine_gap, max_time_gap)
+                if est_voisin:
+                    voisins[noeud].add(autre)
+                    voisins[autre].add(noeud)
+
+
+def maj_coloriage(
+        coloriage: dict[tuple[float, float, float], set[str]],
+        partition: dict[str, set[Noeud]],
+        voisins: dict[Noeud, set[Noeud]],
+        valeurs_touchees: set[str],
+        ) -> tuple[dict[tuple[float, float, float], set[str]], set[str]]:
+    """
+    Met à jour un coloriage après des modifications du graphe qui ne concernent que les valeurs valeurs_touchees.
+    Les autres valeurs gardent leur couleur. Une valeur touchée garde aussi la sienne si elle n'est en conflit avec
+    aucune valeur adjacente, sinon (ou si c'est une nouvelle valeur) elle prend la plus petite couleur libre, des
+    valeurs de plus grand degré aux plus petites. Les nouvelles couleurs éventuelles sont générées à la fin en
+    gardant les couleurs RGB existantes (voir reutiliser_couleurs).
+
+    :param coloriage: Coloriage actuel, couleur RGB en clé.
+    :type coloriage: dict[tuple[float, float, float], set[str]]
+    :param partition: Partition des noeuds selon le critère, après les modifications.
+    :type partition: dict[str, set[Noeud]]
+    :param voisins: Graphe des voisins, après les modifications (voir maj_voisins).
+    :type voisins: dict[Noeud, set[Noeud]]
+    :param valeurs_touchees: Valeurs du critère dont un noeud a été ajouté, supprimé ou modifié.
+    :type valeurs_touchees: set[str]
+    :return: Le nouveau coloriage et l'ensemble des valeurs qui ont changé de couleur
+    :rtype: tuple[dict[tuple[float, float, float], set[str]], set[str]]
+    """
+    from operators.AlgorithmeColoriage import AlgorithmeColoriage, reutiliser_couleurs
+
+    with profileur.mesure("maj_coloriage"):
+        couleurs_rgb = list(coloriage.keys())
+        ancienne_couleur = {}
+        for numero, couleur in enumerate(couleurs_rgb):
+            for valeur in coloriage[couleur]:
+                ancienne_couleur[valeur] = numero
+        # Les valeurs qui n'ont plus de noeud disparaissent du coloriage
+        couleur = {valeur: numero for valeur, numero in ancienne_couleur.items() if valeur in partition}
+
+        critere_du_noeud = {}
+        for valeur, noeuds in partition.items():
+            for noeud in noeuds:
+                critere_du_noeud[noeud] = valeur
+
+        def adjacentes(valeur: str) -> set[str]:
+            return {critere_du_noeud[voisin] for noeud in partition[valeur] for voisin in voisins[noeud]} - {valeur}
+
+        # Toute nouvelle arête a une extrémité dans une valeur touchée : les conflits ne peuvent venir que d'elles
+        touchees = sorted(
+            (valeur for valeur in valeurs_touchees if valeur in partition),
+            key=lambda valeur: len(adjacentes(valeur)),
+            reverse=True,
+        )
+        a_colorier = []
+        for valeur in touchees:
+            if valeur in couleur and any(couleur.get(u) == couleur[valeur] for u in adjacentes(valeur)):
+                del couleur[valeur]
+            if valeur not in couleur:
+                a_colorier.append(valeur)
+        for valeur in a_colorier:
+            interdites = {couleur[u] for u in adjacentes(valeur) if u in couleur}
+            numero = 0
+            while numero in interdites:
+                numero += 1
+            couleur[valeur] = numero
+
+        # On renumérote les couleurs utilisées de 0 à k-1 en gardant l'ordre des couleurs existantes
+        utilisees = sorted(set(couleur.values()))
+        coloriage_indices = {k: set() for k in range(len(utilisees))}
+        renumerotation = {numero: k for k, numero in enumerate(utilisees)}
+        for valeur, numero in couleur.items():
+            coloriage_indices[renumerotation[numero]].add(valeur)
+
+        if all(numero < len(couleurs_rgb) for numero in utilisees):
+            nouveau = {couleurs_rgb[numero]: coloriage_indices[renumerotation[numero]] for numero in utilisees}
+        else:
+            nouveau = reutiliser_couleurs(coloriage, AlgorithmeColoriage.attribuer_couleurs(coloriage_indices))
+
+    couleur_finale = {valeur: rgb for rgb, valeurs in nouveau.items() for valeur in valeurs}
+    recoloriees = {
+        valeur for valeur, rgb in couleur_finale.items()
+        if valeur not in ancienne_couleur or couleurs_rgb[ancienne_couleur[valeur]] != rgb
+    }
+    return nouveau, recoloriees
@@ -0,0 +1,112 @@
+"""
+Vérification d'un coloriage : deux valeurs différentes du critère qui ont des noeuds voisins ne doivent pas avoir
+la même couleur.
+Le graphe est mis sous forme de tableau d'arêtes (indices dans liste_noeuds), chaque noeud reçoit le numéro de sa
+valeur du critère et chaque valeur le numéro de sa couleur : toutes les arêtes sont alors vérifiées d'un coup avec
+numpy, ce qui reste rapide sur des graphes de plusieurs millions d'arêtes.
+"""
+
+from typing import Hashable, List
+import numpy as np
+
+from core.Noeud import Noeud
+from core.Profilage import profileur
+
+
+def tableau_aretes(
+        liste_noeuds: List[Noeud],
+        voisins: dict[Noeud, set[Noeud]]
+        ) -> np.ndarray:
+    """
+    Convertit le dictionnaire des voisins en tableau d'arêtes (même format que GrapheShards.aretes_par_shards).
+
+    :param liste_noeuds: Liste des noeuds, l'indice d'un noeud dans cette liste est son numéro dans le tableau.
+    :type liste_noeuds: List[Noeud]
+    :param voisins: Dictionnaire des voisins de chaque noeud.
+    :type voisins: dict[Noeud, set[Noeud]]
+    :return: Tableau (m, 2) des arêtes (i, j) avec i < j
+    :rtype: np.ndarray
+    """
+    indice = {noeud: i for i, noeud in enumerate(liste_noeuds)}
+    degres = np.fromiter((len(voisins[noeud]) for noeud in liste_noeuds), dtype=np.int64, count=len(liste_noeuds))
+    sources = np.repeat(np.arange(len(liste_noeuds), dtype=np.int64), degres)
+    cibles = np.fromiter(
+        (indice[voisin] for noeud in liste_noeuds for voisin in voisins[noeud]), dtype=np.int64, count=len(sources)
+    )
+    # Chaque arête apparaît dans les deux sens, on ne garde que i < j
+    garder = sources < cibles
+    return np.column_stack((sources[garder], cibles[garder]))
+
+
+def valider_coloriage(
+        liste_noeuds: List[Noeud],
+        critere: str,
+        coloriage: dict[Hashable, set[str]],
+        voisins: dict[Noeud, set[Noeud]] | None = None,
+        aretes: np.ndarray | None = None,
+        ) -> dict:
+    """
+    Vérifie toutes les arêtes du graphe et renvoie un rapport des conflits.
+    Le graphe est donné soit par voisins, soit directement par aretes (par exemple avec aretes_par_shards).
+
+    :param liste_noeuds: Liste des noeuds coloriés.
+    :type liste_noeuds: List[Noeud]
+    :param critere: Critère du coloriage.
+    :type critere: str
+    :param coloriage: Coloriage à vérifier, les clés sont les couleurs (RGB ou numéros) et les valeurs les ensembles de
+        valeurs du critère.
+    :type coloriage: dict[Hashable, set[str]]
+    :param voisins: Dictionnaire des voisins de chaque noeud.
+    :type voisins: dict[Noeud, set[Noeud]] | None
+    :param aretes: Tableau (m, 2) des arêtes en indices de liste_noeuds.
+    :type aretes: np.ndarray | None
+    :return: Dictionnaire avec "valide" (bool), "nb_aretes", "conflits" (liste de (valeur1, valeur2, couleur,
+        nombre d'arêtes en conflit), des plus nombreux aux moins nombreux) et "non_colories" (valeurs du critère
+        sans couleur)
+    :rtype: dict
+    """
+    if aretes is None:
+        if voisins is None:
+            raise ValueError("Il faut donner le graphe, soit par voisins soit par aretes")
+        aretes = tableau_aretes(liste_noeuds, voisins)
+
+    with profileur.mesure("validation_coloriage"):
+        # Numéro de la valeur du critère de chaque noeud
+        valeurs = sorted({getattr(noeud, critere) for noeud in liste_noeuds})
+        numero_valeur = {valeur: k for k, valeur in enumerate(valeurs)}
+        classes = np.fromiter(
+            (numero_valeur[getattr(noeud, critere)] for noeud in liste_noeuds), dtype=np.int64, count=len(liste_noeuds)
+        )
+
+        # Numéro de couleur de chaque valeur du critère, -1 si la valeur n'a pas de couleur
+        couleurs = list(coloriage.keys())
+        couleur_classe = np.full(len(valeurs), -1, dtype=np.int64)
+        for numero, couleur in enumerate(couleurs):
+            for valeur in coloriage[couleur]:
+                if valeur in numero_valeur:
+                    couleur_classe[numero_valeur[valeur]] = numero
+        non_colories = [valeurs[k] for k in np.flatnonzero(couleur_classe < 0)]
+
+        classe_i = classes[aretes[:, 0]]
+        classe_j = classes[aretes[:, 1]]
+        couleur_i = couleur_classe[classe_i]
+        en_conflit = (classe_i != classe_j) & (couleur_i == couleur_classe[classe_j]) & (couleur_i >= 0)
+
+        # Regroupement des arêtes en conflit par paire de valeurs (la plus petite en premier)
+        paires = np.column_stack((
+            np.minimum(classe_i[en_conflit], classe_j[en_conflit]),
+            np.maximum(classe_i[en_conflit], classe_j[en_conflit]),
+        ))
+        conflits = []
+        if len(paires):
+            paires, nombres = np.unique(paires, axis=0, return_counts=True)
+            for (a, b), nombre in sorted(zip(paires.tolist(), nombres.tolist()), key=lambda p: p[1], reverse=True):
+                conflits.append((valeurs[a], valeurs[b], couleurs[couleur_classe[a]], nombre))
+
+    profileur.compteur("conflits_coloriage", len(conflits))
+    return {
+        "valide": not conflits and not non_colories,
+        "nb_aretes": len(aretes),
+        "conflits": conflits,
+        "non_colories": non_colories,
+    }
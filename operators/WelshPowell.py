@@ -5,7 +5,7 @@ DSATUR arrivait à en trouver presque moitié moins pour colorier le graphe
 
 from operators.AlgorithmeColoriage import AlgorithmeColoriage
 from core.Noeud import Noeud
-from datetime import datetime
+from core.Profilage import profileur
 from typing import List
 
 
@@ -20,29 +20,32 @@ class WelshPowell(AlgorithmeColoriage):
     trouver le coloriage d'un graphe.
     """
 
-    def trouver_coloriage(
+    def trouver_coloriage_indices(
         self, 
         liste_noeuds: List[Noeud], 
-        critere: str
+        critere: str,
+        voisins: dict[Noeud, set[Noeud]] | None = None,
         ) -> dict[int, set[str]]:
         """
-        A partir de la liste des noeuds et d'fun critère, associe une couleur à chaque partie de la partition.\n
+        A partir de la liste des noeuds et d'fun critère, associe un numéro de couleur à chaque partie de la partition.\n
         Par exemple, le résultat est sous la forme : \n
-        {(201.1, 203, 205):[valeur1_du_critere,valeur3_du_critere], \n
-        (50.20, 209, 199):[valeur2_du_critere,valeur4_du_critere]} \n
-        Cela signifie que les parties ayant valeur1_du_critere et valeur3_du_critere seront coloriés avec la couleur RGB (201.1, 203, 205)\n
-        Et les partie ayant valeur2_du_critere et valeur4_du_critere seront coloriés avec la couleur (50.20, 209, 199)
+        {0:[valeur1_du_critere,valeur3_du_critere], \n
+        1:[valeur2_du_critere,valeur4_du_critere]} \n
+        trouver_coloriage (hérité de AlgorithmeColoriage) remplace ensuite les numéros par des couleurs RGB.
 
 
         :param liste_noeuds: Dictionnaire dont les clés sont les différentes valeurs du critère et la valeurs l'ensemble des noeuds ayant cette valeur de critère
         :type liste_noeuds: List[Noeud]
         :param critere: String correspondant au critere que l'on souhaite différencier sur notre coloriage
         :type critere: str
+        :param voisins: Graphe des voisins déjà calculé, s'il vaut None il est calculé avec self.voisins
+        :type voisins: dict[Noeud, set[Noeud]] | None
         :return: Dictionnaire dont les clés sont le numéro de couleur et la valeur la liste des valeurs de critères qui seront coloriés de cette couleur
         :rtype: dict[int, set[str]]
         """
         partition = Noeud.partition(liste_noeuds, critere=critere)  # Partition de la liste de noeud selon le critère par défaut codeof
-        voisins = Noeud.voisins_noeud(liste_noeuds)  # Dictionnaire des voisins des noeuds
+        if voisins is None:
+            voisins = self.voisins(liste_noeuds)  # Dictionnaire des voisins des noeuds
         voisins_partition = {
             critere: set.union(
                 *[voisins[noeud] for noeud in noeuds]
@@ -50,62 +53,67 @@ class WelshPowell(AlgorithmeColoriage):
             for critere, noeuds in partition.items()
         }
 
-        critere = {}
-        for valeur, noeuds in partition.items():
-            for noeud in noeuds:
-                critere[noeud] = valeur
-        # Initialisation du dictionnaire associant les couleurs aux noeuds
-        couleurs_noeuds = {}
-        couleur_actuelle = 1
-        meme_couleur = []
-
-        # On trie les sommets de la liste par ordre decroissant
-        liste_noeuds.sort(key=lambda noeud: degre(noeud, voisins), reverse=True)
-
-        # Tant qu'il reste des sommets non encore colores
-        while len(couleurs_noeuds) < len(liste_noeuds):
-
-            # On attribue un couleur au premier non colore par ordre de degre decroissant
-            for noeud in liste_noeuds:
-                if noeud not in couleurs_noeuds:
-                    premier = critere[noeud]
-                    break  # on trouve le premier et on sort de la boucle
-
-            ensemble_voisins = (
-                set.union(*[voisins_partition[critere] for critere in meme_couleur])
-                if meme_couleur
-                else set()
-            )
-            # if premier not in (set.union(*[voisins_partition[critere] for critere in meme_couleur])):
-
-            if noeud not in ensemble_voisins:
-                meme_couleur.append(premier)
-
-            else:
-                couleur_actuelle += 1
-                meme_couleur = [premier]
-
-            for noeud in partition[premier]:
-                couleurs_noeuds[noeud] = couleur_actuelle
-
-        # On construit maintenant le dictionnaire resultat
-        res = {}
-
-        for critere, noeuds in partition.items():
-            # on suppose que tous les noeuds de la partie ont la même couleur
-            noeud_exemple = next(
-                iter(noeuds)
-            )  # pour recuperer un noeud dans l'ensemble des noeuds associes a la valeur de critere
-            if noeud_exemple in couleurs_noeuds:
-                c = couleurs_noeuds[noeud_exemple]
-            else:
-                c = couleurs_noeuds[critere]
-
-            if c not in res:
-                res[c] = set()
-
-            res[c].add(critere)
-
+        with profileur.mesure("welsh_powell"):
+            critere = {}
+            for valeur, noeuds in partition.items():
+                for noeud in noeuds:
+                    critere[noeud] = valeur
+            # Initialisation du dictionnaire associant les couleurs aux noeuds
+            couleurs_noeuds = {}
+            couleur_actuelle = 1
+            meme_couleur = []
+
+            # On trie les sommets par ordre decroissant, dans une copie : l'ordre de la liste de l'appelant
+            # compte pour est_voisin
+            liste_noeuds = sorted(liste_noeuds, key=lambda noeud: degre(noeud, voisins), reverse=True)
+
+            # Tant qu'il reste des sommets non encore colores
+            while len(couleurs_noeuds) < len(liste_noeuds):
+
+                # On attribue un couleur au premier non colore par ordre de degre decroissant
+                for noeud in liste_noeuds:
+                    if noeud not in couleurs_noeuds:
+                        premier = critere[noeud]
+                        break  # on trouve le premier et on sort de la boucle
+
+                ensemble_voisins = (
+                    set.union(*[voisins_partition[critere] for critere in meme_couleur])
+                    if meme_couleur
+                    else set()
+                )
+                # if premier not in (set.union(*[voisins_partition[critere] for critere in meme_couleur])):
+
+                # Aucun noeud de la valeur ne doit être voisin d'une valeur qui a déjà cette couleur
+                if ensemble_voisins.isdisjoint(partition[premier]):
+                    meme_couleur.append(premier)
+
+                else:
+                    couleur_actuelle += 1
+                    meme_couleur = [premier]
+
+                for noeud in partition[premier]:
+                    couleurs_noeuds[noeud] = couleur_actuelle
+
+            # On construit maintenant le dictionnaire resultat
+            res = {}
+
+            for critere, noeuds in partition.items():
+                # on suppose que tous les noeuds de la partie ont la même couleur
+                noeud_exemple = next(
+                    iter(noeuds)
+                )  # pour recuperer un noeud dans l'ensemble des noeuds associes a la valeur de critere
+                if noeud_exemple in couleurs_noeuds:
+                    c = couleurs_noeuds[noeud_exemple]
+                else:
+                    c = couleurs_noeuds[critere]
+                c -= 1  # Les couleurs sont numérotées à partir de 1 dans la boucle
+
+                if c not in res:
+                    res[c] = set()
+
+                res[c].add(critere)
+
+        profileur.compteur("couleurs_utilisees", len(res))
         return res
 
 
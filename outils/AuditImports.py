@@ -0,0 +1,78 @@
+"""
+Audit du temps d'import des modules du projet à partir de `python -X importtime`.
+Chaque module est importé dans un nouveau processus, on vérifie :
+    - que les modules lourds (pandas, tkinter, basic_colormath) ne sont pas importés là où ils ne sont pas utiles,
+    - que le temps d'import cumulé reste sous un budget (en millisecondes).
+Le script renvoie un code de sortie non nul si une règle n'est pas respectée, il peut donc servir de test de
+non-régression :
+    python -m outils.AuditImports
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+RACINE = Path(__file__).resolve().parent.parent
+
+# module : (modules interdits à l'import, budget en ms)
+BUDGETS = {
+    "core.Noeud": (("numpy", "pandas", "tkinter", "basic_colormath"), 100),
+    "operators.AlgorithmeColoriage": (("pandas", "tkinter", "basic_colormath"), 250),
+    "operators.WelshPowell": (("pandas", "tkinter", "basic_colormath"), 250),
+    "operators.GenerateurCouleur": (("pandas", "tkinter", "basic_colormath"), 250),
+    "operators.GenerateurTabulaire": (("pandas", "tkinter", "basic_colormath"), 100),
+    "operators.Chargement": (("pandas", "tkinter", "basic_colormath"), 100),
+    "operators.ValidationColoriage": (("pandas", "tkinter", "basic_colormath"), 250),
+    "core.DiagrammeGant": (("pandas", "basic_colormath"), 400),
+    "batch": (("pandas", "tkinter", "basic_colormath"), 300),
+    "service": (("pandas", "tkinter", "basic_colormath"), 300),
+}
+
+
+def mesurer_import(module: str) -> dict[str, int]:
+    """
+    Importe un module dans un nouvel interpréteur et renvoie le temps cumulé (en µs) de chaque module importé.
+
+    :param module: Nom du module à importer.
+    :type module: str
+    :return: Dictionnaire avec pour clé le nom de chaque module importé et pour valeur son temps cumulé en µs
+    :rtype: dict[str, int]
+    """
+    resultat = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=RACINE,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    temps = {}
+    for ligne in resultat.stderr.splitlines():
+        if not ligne.startswith("import time:") or "cumulative" in ligne:
+            continue
+        _, cumule, nom = ligne.split("|")
+        temps[nom.strip()] = int(cumule)
+    return temps
+
+
+def auditer() -> list[str]:
+    """
+    Vérifie chaque module de BUDGETS et renvoie la liste des erreurs (vide si tout est respecté).
+    """
+    erreurs = []
+    for module, (interdits, budget_ms) in BUDGETS.items():
+        temps = mesurer_import(module)
+        total_ms = temps.get(module, 0) / 1000
+        charges = [nom for nom in interdits if nom in temps]
+        print(f"{module:<35} {total_ms:8.1f} ms (budget {budget_ms} ms)")
+        if charges:
+            erreurs.append(f"{module} importe {', '.join(charges)}")
+        if total_ms > budget_ms:
+            erreurs.append(f"{module} met {total_ms:.1f} ms à s'importer (budget {budget_ms} ms)")
+    return erreurs
+
+
+if __name__ == "__main__":
+    erreurs = auditer()
+    for erreur in erreurs:
+        print(f"ERREUR : {erreur}")
+    sys.exit(1 if erreurs else 0)
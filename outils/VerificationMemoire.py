@@ -0,0 +1,123 @@
+"""
+Vérification du pipeline en mémoire (voir Chargement.charger_planification) par rapport à l'ancien aller-retour par
+fichiers : pour chaque planning,
+    - les noeuds et les lignes des machines construits en mémoire doivent être ceux relus dans
+      Planification_modifiee.txt et Machine_modifie.txt (charger_noeuds),
+    - pour chaque critère, le fichier résultat écrit depuis le planning en mémoire doit être identique, octet par
+      octet, à celui écrit en relisant Planification_modifiee.txt et à celui écrit depuis le planning reconstruit à
+      partir des noeuds (donnees_depuis_noeuds, utilisé par DiagrammeGant sans planning en mémoire),
+    - l'export par colonnes (ecritureFichierColonnes) relu avec lectureFichierColonnes doit redonner le numéro de
+      couleur de chaque opération, y compris -1 pour toutes les opérations quand le coloriage est vide (fenêtre sans
+      opération).
+Le script renvoie un code de sortie non nul en cas d'écart, il peut donc servir de test de non-régression :
+    python -m outils.VerificationMemoire
+"""
+
+import argparse
+from pathlib import Path
+import sys
+import tempfile
+
+import numpy as np
+
+from core.Noeud import Noeud
+from operators.AlgorithmeColoriage import (
+    DSATUR, ecritureFichierColoriage, ecritureFichierColonnes, lectureFichierColonnes
+)
+from operators.Chargement import charger_noeuds, charger_planification, donnees_depuis_noeuds
+
+RACINE = Path(__file__).resolve().parent.parent
+
+
+def verifier_colonnes(coloriage: dict, donnees, critere: str, chemin_sortie: Path) -> str | None:
+    """
+    Ecrit l'export par colonnes, le relit et compare les numéros de couleur relus aux numéros attendus.
+
+    :return: La description de l'écart, None si les couleurs relues sont les bonnes
+    :rtype: str | None
+    """
+    numero_par_valeur = {str(valeur): numero for numero, valeurs in enumerate(coloriage.values()) for valeur in valeurs}
+    attendus = np.array([numero_par_valeur.get(str(valeur), -1) for valeur in donnees[critere]])
+    colonnes, palette, _ = lectureFichierColonnes(ecritureFichierColonnes(coloriage, donnees, critere, chemin_sortie))
+    couleurs = np.asarray(colonnes["couleur"])
+    if len(palette) != len(coloriage) or not np.array_equal(couleurs.astype(np.int64), attendus):
+        return f"{np.count_nonzero(couleurs != attendus)} couleurs relues différentes ({couleurs.dtype})"
+    return None
+
+
+def verifier(chemin_data: Path, chemin_machines: Path) -> list[str]:
+    """
+    Compare les deux pipelines pour un planning et renvoie la liste des erreurs (vide si tout est identique).
+
+    :param chemin_data: Chemin du fichier Planification.
+    :type chemin_data: Path
+    :param chemin_machines: Chemin du fichier Machine.
+    :type chemin_machines: Path
+    :return: Liste des erreurs
+    :rtype: list[str]
+    """
+    erreurs = []
+    with tempfile.TemporaryDirectory() as dossier:
+        dossier = Path(dossier)
+        liste_noeuds, mapping_machines, donnees = charger_planification(
+            chemin_data, chemin_machines, dossier_sortie=dossier, ecrire_fichiers=True
+        )
+        chemin_modifie = dossier / "Planification_modifiee.txt"
+        noeuds_fichier, mapping_fichier = charger_noeuds(chemin_modifie, dossier / "Machine_modifie.txt")
+        if noeuds_fichier != liste_noeuds:
+            differents = sum(a != b for a, b in zip(liste_noeuds, noeuds_fichier))
+            erreurs.append(
+                f"{chemin_data.name} : {len(liste_noeuds)} noeuds en mémoire, {len(noeuds_fichier)} relus, "
+                f"{differents} différents"
+            )
+        if mapping_fichier != mapping_machines:
+            erreurs.append(f"{chemin_data.name} : lignes des machines différentes")
+
+        # Coloriage déterministe, écrit une fois par chaque chemin
+        algo = DSATUR(aleatoire=False)
+        voisins = algo.voisins(liste_noeuds)
+        reconstruites = donnees_depuis_noeuds(liste_noeuds)
+        for critere in Noeud.criteres_partition:
+            coloriage = algo.trouver_coloriage(liste_noeuds, critere, voisins)
+            resultat_memoire = dossier / f"Resultats_{critere}_memoire.txt"
+            resultat_fichier = dossier / f"Resultats_{critere}_fichier.txt"
+            resultat_noeuds = dossier / f"Resultats_{critere}_noeuds.txt"
+            ecritureFichierColoriage(coloriage, donnees, critere, resultat_memoire)
+            ecritureFichierColoriage(coloriage, chemin_modifie, critere, resultat_fichier)
+            ecritureFichierColoriage(coloriage, reconstruites, critere, resultat_noeuds)
+            identiques = (
+                resultat_memoire.read_bytes() == resultat_fichier.read_bytes() == resultat_noeuds.read_bytes()
+            )
+            etat = "identiques" if identiques else "différents"
+            print(f"{chemin_data.name} {critere} : {len(coloriage)} couleurs, fichiers {etat}")
+            if not identiques:
+                erreurs.append(f"{chemin_data.name} : fichiers Resultats différents pour le critère {critere}")
+            ecart = verifier_colonnes(coloriage, donnees, critere, dossier / f"Resultats_{critere}")
+            if ecart is not None:
+                erreurs.append(f"{chemin_data.name} : export par colonnes du critère {critere} : {ecart}")
+
+        # Fenêtre sans opération : coloriage vide, aucune opération n'a de couleur
+        ecart = verifier_colonnes({}, donnees, "codof", dossier / "Resultats_vide")
+        print(f"{chemin_data.name} coloriage vide : export par colonnes {'correct' if ecart is None else 'faux'}")
+        if ecart is not None:
+            erreurs.append(f"{chemin_data.name} : export par colonnes d'un coloriage vide : {ecart}")
+    return erreurs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare le pipeline en mémoire au pipeline par fichiers.")
+    parser.add_argument(
+        "plannings",
+        nargs="*",
+        type=Path,
+        default=[RACINE / "ressources" / "Planification.txt", RACINE / "ressources" / "Planification_complexe.txt"],
+    )
+    parser.add_argument("--machines", type=Path, default=RACINE / "ressources" / "Machine.txt")
+    args = parser.parse_args()
+
+    erreurs = []
+    for chemin in args.plannings:
+        erreurs += verifier(chemin, args.machines)
+    for erreur in erreurs:
+        print(f"ERREUR : {erreur}")
+    sys.exit(1 if erreurs else 0)
@@ -0,0 +1,119 @@
+"""
+Vérification du service de coloriage (voir service.py) démarré dans un nouveau processus : des requêtes envoyées à
+froid et en même temps (les processus de calcul démarrent pendant que les connexions sont ouvertes) doivent toutes
+recevoir une réponse complète. Chaque réponse est lue jusqu'à la fermeture de la connexion, comme le ferait un client
+qui ne regarde pas Content-Length : une connexion restée ouverte est une erreur.
+Le script renvoie un code de sortie non nul en cas d'erreur, il peut donc servir de test de non-régression :
+    python -m outils.VerificationService
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+from pathlib import Path
+import socket
+import subprocess
+import sys
+import time
+
+RACINE = Path(__file__).resolve().parent.parent
+
+# Délai maximum (en secondes) pour le démarrage du service et pour chaque réponse
+DELAI = 30
+
+# (description, corps JSON de la requête POST /coloriage, statut attendu)
+REQUETES = [
+    ("coloriage à froid Planification", '{"planning": "ressources/Planification.txt", "critere": "codof"}', 200),
+    (
+        "coloriage à froid Planification_complexe",
+        '{"planning": "ressources/Planification_complexe.txt", "critere": "codop"}',
+        200,
+    ),
+    ("planning absent", '{"planning": "ressources/absent.txt"}', 400),
+    ("corps qui n'est pas un objet", "[]", 400),
+    ("paramètre du mauvais type", '{"planning": "ressources/Planification.txt", "algo": []}', 400),
+    ("JSON invalide", "{", 400),
+]
+
+
+def port_libre() -> int:
+    """
+    Renvoie un port TCP libre sur 127.0.0.1.
+    """
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def envoyer(port: int, requete: bytes) -> tuple[int, bytes, float]:
+    """
+    Envoie une requête HTTP brute et lit la réponse jusqu'à la fermeture de la connexion.
+
+    :param port: Port du service.
+    :type port: int
+    :param requete: Requête HTTP complète.
+    :type requete: bytes
+    :return: Le statut, le corps de la réponse et la durée en secondes
+    :rtype: tuple[int, bytes, float]
+    """
+    debut = time.perf_counter()
+    with socket.create_connection(("127.0.0.1", port), timeout=DELAI) as connexion:
+        connexion.sendall(requete)
+        reponse = b""
+        while morceau := connexion.recv(65536):
+            reponse += morceau
+    entetes, _, corps = reponse.partition(b"\r\n\r\n")
+    return int(entetes.split()[1]), corps, time.perf_counter() - debut
+
+
+def requete_post(corps: str) -> bytes:
+    contenu = corps.encode("utf-8")
+    return (
+        f"POST /coloriage HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Length: {len(contenu)}\r\n\r\n".encode("latin-1")
+        + contenu
+    )
+
+
+def verifier() -> list[str]:
+    """
+    Démarre le service, envoie les requêtes de REQUETES en même temps et renvoie la liste des erreurs.
+    """
+    port = port_libre()
+    service = subprocess.Popen(
+        [sys.executable, "service.py", "--port", str(port), "--workers", "2"], cwd=RACINE, stdout=subprocess.DEVNULL
+    )
+    erreurs = []
+    try:
+        limite = time.monotonic() + DELAI
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                if time.monotonic() > limite or service.poll() is not None:
+                    return ["le service n'a pas démarré"]
+                time.sleep(0.1)
+
+        with ThreadPoolExecutor(max_workers=len(REQUETES)) as executor:
+            futures = [executor.submit(envoyer, port, requete_post(corps)) for _, corps, _ in REQUETES]
+            for (description, _, attendu), future in zip(REQUETES, futures):
+                try:
+                    statut, corps, duree = future.result()
+                except socket.timeout:
+                    erreurs.append(f"{description} : connexion toujours ouverte après {DELAI} s")
+                    continue
+                print(f"{description} : statut {statut} en {duree:.2f} s")
+                if statut != attendu:
+                    erreurs.append(f"{description} : statut {statut} au lieu de {attendu}")
+                else:
+                    json.loads(corps)
+    finally:
+        service.terminate()
+        service.wait()
+    return erreurs
+
+
+if __name__ == "__main__":
+    erreurs = verifier()
+    for erreur in erreurs:
+        print(f"ERREUR : {erreur}")
+    sys.exit(1 if erreurs else 0)
@@ -0,0 +1,90 @@
+"""
+Vérification du graphe des voisins construit par tranches de temps (voir GrapheShards) : pour chaque planning et
+chaque jeu de paramètres, les arêtes de voisins_par_shards doivent être exactement celles de Noeud.voisins_noeud
+(comparaison paire à paire).
+Le script renvoie un code de sortie non nul si un graphe diffère, il peut donc servir de test de non-régression :
+    python -m outils.VerificationShards
+    python -m outils.VerificationShards ressources/Planification.txt --machines ressources/Machine.txt
+"""
+
+import argparse
+from datetime import timedelta
+from pathlib import Path
+import sys
+
+from core.GrapheShards import voisins_par_shards
+from core.Noeud import Noeud
+from operators.Chargement import charger_planification
+
+RACINE = Path(__file__).resolve().parent.parent
+JOUR = timedelta(days=1)
+
+PLANNINGS = [RACINE / "ressources" / "Planification.txt", RACINE / "ressources" / "Planification_complexe.txt"]
+
+# (max_machine_gap, max_time_gap, taille_shard, max_workers) : des tranches plus petites, égales et plus grandes que
+# max_time_gap, en séquentiel et avec plusieurs processus
+PARAMETRES = [
+    (2, timedelta(days=21), timedelta(days=28), 1),
+    (2, timedelta(days=21), timedelta(days=7), 2),
+    (2, timedelta(days=21), timedelta(days=21), 2),
+    (8, timedelta(days=7), timedelta(days=1), 2),
+    (0, timedelta(0), timedelta(hours=12), 1),
+]
+
+
+def aretes(voisins: dict[Noeud, set[Noeud]], indice: dict[Noeud, int]) -> set[tuple[int, int]]:
+    """
+    Renvoie les arêtes du graphe en couples d'indices (i, j) avec i < j.
+    """
+    return {
+        (min(indice[noeud], indice[voisin]), max(indice[noeud], indice[voisin]))
+        for noeud, adjacents in voisins.items()
+        for voisin in adjacents
+    }
+
+
+def verifier(chemin_data: Path, chemin_machines: Path) -> list[str]:
+    """
+    Compare les deux constructions du graphe pour un planning et renvoie la liste des erreurs (vide si tout est
+    identique).
+
+    :param chemin_data: Chemin du fichier Planification.
+    :type chemin_data: Path
+    :param chemin_machines: Chemin du fichier Machine.
+    :type chemin_machines: Path
+    :return: Liste des erreurs
+    :rtype: list[str]
+    """
+    liste_noeuds, _, _ = charger_planification(chemin_data, chemin_machines)
+    indice = {noeud: i for i, noeud in enumerate(liste_noeuds)}
+    erreurs = []
+    for max_machine_gap, max_time_gap, taille_shard, max_workers in PARAMETRES:
+        attendues = aretes(Noeud.voisins_noeud(liste_noeuds, max_machine_gap, max_time_gap), indice)
+        obtenues = aretes(
+            voisins_par_shards(liste_noeuds, max_machine_gap, max_time_gap, taille_shard, max_workers), indice
+        )
+        description = (
+            f"{chemin_data.name} (gap machine {max_machine_gap}, gap temps {max_time_gap / JOUR:g} j, "
+            f"tranches {taille_shard / JOUR:g} j, {max_workers} processus)"
+        )
+        print(f"{description} : {len(attendues)} arêtes, {len(obtenues)} par tranches")
+        if attendues != obtenues:
+            erreurs.append(
+                f"{description} : {len(attendues - obtenues)} arêtes manquantes, "
+                f"{len(obtenues - attendues)} arêtes en trop"
+            )
+    return erreurs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare le graphe par tranches au graphe paire à paire.")
+    parser.add_argument("plannings", nargs="*", type=Path, default=PLANNINGS)
+    parser.add_argument("--machines", type=Path, default=RACINE / "ressources" / "Machine.txt")
+    args = parser.parse_args()
+
+    erreurs = []
+    for chemin in args.plannings:
+        erreurs += verifier(chemin, args.machines)
+    for erreur in erreurs:
+        print(f"ERREUR : {erreur}")
+    sys.exit(1 if erreurs else 0)
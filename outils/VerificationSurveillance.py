@@ -0,0 +1,180 @@
+"""
+Vérification du mode surveillance (voir Surveillance) : on applique à un planning plusieurs séries de modifications
+aléatoires (opérations supprimées, décalées, changées de ligne ou ajoutées à n'importe quelle position, lignes du
+fichier réordonnées), comme si le fichier était réécrit par l'ordonnanceur. La première série réécrit le fichier à
+l'envers sans rien changer d'autre. Après chaque série :
+    - le graphe mis à jour par maj_voisins (ou reconstruit si des lignes conservées ont changé d'ordre, voir
+      ordre_conserve) doit être exactement celui reconstruit par Noeud.voisins_noeud,
+    - le coloriage mis à jour par maj_coloriage doit être valide et les valeurs non touchées doivent garder leur
+      couleur.
+Le script renvoie un code de sortie non nul en cas d'écart, il peut donc servir de test de non-régression :
+    python -m outils.VerificationSurveillance
+    python -m outils.VerificationSurveillance --series 20 --graine 3
+"""
+
+import argparse
+from dataclasses import replace
+from datetime import timedelta
+from pathlib import Path
+import random
+import sys
+
+from core.Noeud import Noeud
+from operators.AlgorithmeColoriage import DSATUR
+from operators.Chargement import charger_planification
+from operators.Surveillance import compare_noeuds, maj_coloriage, maj_voisins, ordre_conserve
+from operators.ValidationColoriage import valider_coloriage
+
+RACINE = Path(__file__).resolve().parent.parent
+
+
+def modifier_planning(liste_noeuds: list[Noeud], generateur: random.Random, serie: int) -> list[Noeud]:
+    """
+    Renvoie une copie modifiée du planning : environ 3 % des opérations supprimées, 3 % modifiées (dates décalées ou
+    ligne voisine) et 2 % ajoutées à des positions quelconques, dont la moitié avec un nouveau codof. Une série sur
+    quatre inverse aussi l'ordre d'un bloc de lignes, et la série 1 se contente d'inverser tout le fichier.
+
+    :param liste_noeuds: Planning de départ.
+    :type liste_noeuds: list[Noeud]
+    :param generateur: Générateur aléatoire.
+    :type generateur: random.Random
+    :param serie: Numéro de la série, utilisé pour donner des codes uniques aux opérations ajoutées.
+    :type serie: int
+    :return: Nouveau planning
+    :rtype: list[Noeud]
+    """
+    if serie == 1:
+        return liste_noeuds[::-1]
+    nb_lignes = max(noeud.indice_machine for noeud in liste_noeuds) + 1
+    nouveaux = []
+    for noeud in liste_noeuds:
+        tirage = generateur.random()
+        if tirage < 0.03:
+            continue
+        if tirage < 0.06:
+            decalage = timedelta(hours=generateur.randint(-72, 72))
+            indice_machine = min(max(noeud.indice_machine + generateur.choice((-1, 0, 0, 1)), 0), nb_lignes - 1)
+            noeud = replace(
+                noeud,
+                indice_machine=indice_machine,
+                date_debut=noeud.date_debut + decalage,
+                date_fin=noeud.date_fin + decalage,
+            )
+        nouveaux.append(noeud)
+
+    for numero in range(max(1, len(liste_noeuds) // 50)):
+        modele = generateur.choice(liste_noeuds)
+        codof = f"{modele.codof}-S{serie}" if generateur.random() < 0.5 else modele.codof
+        ajoute = replace(modele, codof=codof, codop=f"{modele.codop}-S{serie}-{numero}")
+        nouveaux.insert(generateur.randint(0, len(nouveaux)), ajoute)
+
+    if serie % 4 == 0:
+        debut = generateur.randint(0, len(nouveaux) // 2)
+        fin = generateur.randint(debut + 2, len(nouveaux))
+        nouveaux[debut:fin] = nouveaux[debut:fin][::-1]
+    return nouveaux
+
+
+def verifier(
+        chemin_data: Path,
+        chemin_machines: Path,
+        nb_series: int,
+        graine: int,
+        critere: str = "codof",
+        max_machine_gap: int = 2,
+        max_time_gap: timedelta = timedelta(days=21),
+        ) -> list[str]:
+    """
+    Applique nb_series séries de modifications au planning et renvoie la liste des erreurs (vide si les mises à
+    jour incrémentales sont toujours correctes).
+
+    :param chemin_data: Chemin du fichier Planification.
+    :type chemin_data: Path
+    :param chemin_machines: Chemin du fichier Machine.
+    :type chemin_machines: Path
+    :param nb_series: Nombre de séries de modifications, chacune appliquée au résultat de la précédente.
+    :type nb_series: int
+    :param graine: Graine du générateur aléatoire.
+    :type graine: int
+    :param critere: Critère du coloriage mis à jour.
+    :type critere: str
+    :return: Liste des erreurs
+    :rtype: list[str]
+    """
+    generateur = random.Random(graine)
+    liste_noeuds, _, _ = charger_planification(chemin_data, chemin_machines)
+    algo = DSATUR(max_machine_gap, max_time_gap)
+    voisins = algo.voisins(liste_noeuds)
+    coloriage = algo.trouver_coloriage(liste_noeuds, critere, voisins)
+
+    erreurs = []
+    for serie in range(1, nb_series + 1):
+        # Même enchaînement que DiagrammeGant.applique_modifications
+        nouvelle_liste, _, _, _ = compare_noeuds(liste_noeuds, modifier_planning(liste_noeuds, generateur, serie))
+        anciens = set(liste_noeuds)
+        nouveaux = set(nouvelle_liste)
+        retires = [noeud for noeud in liste_noeuds if noeud not in nouveaux]
+        ajoutes = [noeud for noeud in nouvelle_liste if noeud not in anciens]
+        ordre_garde = ordre_conserve(liste_noeuds, nouvelle_liste)
+        liste_noeuds = nouvelle_liste
+        if ordre_garde:
+            maj_voisins(voisins, liste_noeuds, retires, ajoutes, max_machine_gap, max_time_gap)
+        else:
+            voisins = algo.voisins(liste_noeuds)
+
+        complet = Noeud.voisins_noeud(liste_noeuds, max_machine_gap, max_time_gap)
+        reconstruit = "" if ordre_garde else ", ordre changé : graphe reconstruit"
+        print(
+            f"{chemin_data.name} série {serie} : {len(retires)} retirées, {len(ajoutes)} ajoutées, "
+            f"{sum(map(len, complet.values())) // 2} arêtes{reconstruit}"
+        )
+        if voisins != complet:
+            differentes = [noeud for noeud in complet if voisins.get(noeud) != complet[noeud]]
+            differentes += [noeud for noeud in voisins if noeud not in complet]
+            erreurs.append(f"{chemin_data.name} série {serie} : voisins différents pour {len(differentes)} noeuds")
+            # Le graphe est faux, la suite comparerait des erreurs accumulées
+            break
+
+        partition = Noeud.partition(liste_noeuds, critere=critere)
+        if ordre_garde:
+            valeurs_touchees = {getattr(noeud, critere) for noeud in retires + ajoutes}
+        else:
+            valeurs_touchees = set(partition)
+        ancienne_couleur = {valeur: couleur for couleur, valeurs in coloriage.items() for valeur in valeurs}
+        coloriage, _ = maj_coloriage(coloriage, partition, voisins, valeurs_touchees)
+        rapport = valider_coloriage(liste_noeuds, critere, coloriage, voisins)
+        if not rapport["valide"]:
+            erreurs.append(
+                f"{chemin_data.name} série {serie} : {len(rapport['conflits'])} conflits, "
+                f"{len(rapport['non_colories'])} valeurs sans couleur après maj_coloriage"
+            )
+        nouvelle_couleur = {valeur: couleur for couleur, valeurs in coloriage.items() for valeur in valeurs}
+        changees = [
+            valeur for valeur in partition
+            if valeur not in valeurs_touchees and valeur in ancienne_couleur
+            and ancienne_couleur[valeur] != nouvelle_couleur.get(valeur)
+        ]
+        if changees:
+            erreurs.append(f"{chemin_data.name} série {serie} : {len(changees)} valeurs non touchées recoloriées")
+    return erreurs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare les mises à jour incrémentales à une reconstruction.")
+    parser.add_argument(
+        "plannings",
+        nargs="*",
+        type=Path,
+        default=[RACINE / "ressources" / "Planification.txt", RACINE / "ressources" / "Planification_complexe.txt"],
+    )
+    parser.add_argument("--machines", type=Path, default=RACINE / "ressources" / "Machine.txt")
+    parser.add_argument("--series", type=int, default=10, help="Nombre de séries de modifications par planning")
+    parser.add_argument("--graine", type=int, default=0)
+    args = parser.parse_args()
+
+    erreurs = []
+    for chemin in args.plannings:
+        erreurs += verifier(chemin, args.machines, args.series, args.graine)
+    for erreur in erreurs:
+        print(f"ERREUR : {erreur}")
+    sys.exit(1 if erreurs else 0)
@@ -0,0 +1,359 @@
+"""
+Service local de coloriage en HTTP/JSON (asyncio, sans dépendance externe), pour que les outils qui ont besoin d'un
+coloriage n'aient pas à refaire le pipeline de main.py.
+    - Le chargement et le coloriage sont faits dans des processus de calcul, la boucle asyncio reste disponible.
+    - Chaque planning est attribué à un processus (selon sa clé) qui garde ses noeuds et son graphe des voisins
+      dans un cache LRU : seuls les chemins et la clé sont envoyés au processus, et seules les couleurs reviennent.
+    - Les coloriages déjà calculés restent dans le processus principal, dans un cache LRU.
+    - Les requêtes simultanées pour le même planning et le même critère attendent le même calcul.
+
+Exemple :
+    python service.py --port 8765
+    curl -X POST localhost:8765/coloriage -d '{"planning": "ressources/Planification.txt", "critere": "codof"}'
+
+Requête POST /coloriage (seul "planning" est obligatoire) :
+    {"planning": ..., "machines": "ressources/Machine.txt", "critere": "codof", "algo": "dsatur",
+     "max_machine_gap": 2, "max_time_gap": 21}
+Réponse :
+    {"planning": ..., "critere": ..., "nb_operations": ..., "nb_couleurs": ..., "couleurs": {valeur: "#rrggbb"}}
+GET /etat renvoie les plannings du cache et le nombre de requêtes servies par le cache.
+"""
+
+import argparse
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+import json
+import multiprocessing
+import os
+from pathlib import Path
+import signal
+
+from core.Noeud import Noeud
+from operators.AlgorithmeColoriage import DSATUR
+from operators.WelshPowell import WelshPowell
+from operators.Chargement import charger_planification
+
+ALGORITHMES = {"dsatur": DSATUR, "welshpowell": WelshPowell}
+
+# Plannings chargés dans un processus de calcul (noeuds, machines, voisins), par clé de planning
+_plans_processus = OrderedDict()
+_taille_cache_processus = 8
+
+STATUTS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+def _initialiser_processus(taille_cache: int):
+    """
+    Initialise un processus de calcul.
+    """
+    global _taille_cache_processus
+    _taille_cache_processus = taille_cache
+
+
+def _plan_processus(
+        cle: tuple,
+        chemin_data: Path,
+        chemin_machines: Path,
+        max_machine_gap: int,
+        max_time_gap: timedelta
+        ) -> tuple[list[Noeud], dict[str, int], dict[Noeud, set[Noeud]]]:
+    """
+    Renvoie le planning gardé par ce processus de calcul, ou le découpe, le charge et calcule son graphe des voisins
+    s'il n'y est pas (premier appel ou planning sorti du cache).
+
+    :return: Les noeuds, le dictionnaire des machines et le graphe des voisins
+    :rtype: tuple[list[Noeud], dict[str, int], dict[Noeud, set[Noeud]]]
+    """
+    if cle in _plans_processus:
+        _plans_processus.move_to_end(cle)
+        return _plans_processus[cle]
+    liste_noeuds, mapping_machines, _ = charger_planification(chemin_data, chemin_machines)
+    voisins = Noeud.voisins_noeud(liste_noeuds, max_machine_gap, max_time_gap)
+    _plans_processus[cle] = (liste_noeuds, mapping_machines, voisins)
+    while len(_plans_processus) > _taille_cache_processus:
+        _plans_processus.popitem(last=False)
+    return _plans_processus[cle]
+
+
+def _charger_plan(cle: tuple, *parametres) -> tuple[int, dict[str, int]]:
+    """
+    Charge un planning dans le processus de calcul, exécuté dans le processus attribué au planning.
+
+    :return: Le nombre d'opérations et le dictionnaire des machines
+    :rtype: tuple[int, dict[str, int]]
+    """
+    liste_noeuds, mapping_machines, _ = _plan_processus(cle, *parametres)
+    return len(liste_noeuds), mapping_machines
+
+
+def _colorier(cle: tuple, parametres: tuple, nom_algo: str, critere: str) -> dict[str, str]:
+    """
+    Colorie un planning gardé par le processus de calcul, exécuté dans le processus attribué au planning.
+
+    :param cle: Clé du planning (voir ServiceColoriage.plan).
+    :type cle: tuple
+    :param parametres: Chemins et paramètres du graphe, pour recharger le planning s'il est sorti du cache.
+    :type parametres: tuple
+    :return: Dictionnaire avec pour clé chaque valeur du critère et pour valeur sa couleur hexadécimale
+    :rtype: dict[str, str]
+    """
+    liste_noeuds, _, voisins = _plan_processus(cle, *parametres)
+    coloriage = ALGORITHMES[nom_algo]().trouver_coloriage(liste_noeuds, critere, voisins)
+    return {
+        valeur: "#%02x%02x%02x" % tuple(int(c) for c in couleur)
+        for couleur, valeurs in coloriage.items()
+        for valeur in valeurs
+    }
+
+
+class ServiceColoriage:
+    """
+    Service de coloriage : cache des plannings, regroupement des requêtes identiques et processus de calcul.
+    Atttributs :
+        -taille_cache (int) : Nombre maximum de plannings gardés en mémoire (ici et dans chaque processus).
+        -plans (OrderedDict) : Cache LRU, la clé identifie le fichier et ses paramètres, la valeur contient le nombre
+            d'opérations, les machines et les coloriages déjà calculés. Les noeuds et le graphe des voisins restent
+            dans le processus de calcul du planning.
+        -en_cours (dict) : Calculs en cours (chargement ou coloriage), partagés par les requêtes identiques.
+        -executors (list[ProcessPoolExecutor]) : Processus de calcul (un seul processus par executor), un planning
+            est toujours envoyé au même.
+        -servies_par_cache (int) : Nombre de coloriages renvoyés sans calcul.
+    """
+
+    def __init__(self, taille_cache: int = 8, max_workers: int | None = None):
+        self.taille_cache = taille_cache
+        self.plans = OrderedDict()
+        self.en_cours = {}
+        # Les processus de calcul sont démarrés pendant qu'une connexion est ouverte : avec fork ils hériteraient de
+        # son socket et writer.close() ne fermerait pas la connexion (un client qui lit jusqu'à la fin attendrait)
+        methodes = multiprocessing.get_all_start_methods()
+        contexte = multiprocessing.get_context("forkserver" if "forkserver" in methodes else "spawn")
+        self.executors = [
+            ProcessPoolExecutor(
+                max_workers=1, mp_context=contexte, initializer=_initialiser_processus, initargs=(taille_cache,)
+            )
+            for _ in range(max_workers or os.cpu_count() or 1)
+        ]
+        self.servies_par_cache = 0
+
+    def executor(self, cle: tuple) -> ProcessPoolExecutor:
+        """
+        Renvoie le processus de calcul attribué au planning de clé cle (celui qui garde ses noeuds et son graphe).
+        """
+        return self.executors[hash(cle) % len(self.executors)]
+
+    async def _une_fois(self, cle: tuple, calcul):
+        """
+        Lance calcul() une seule fois par clé : les requêtes qui arrivent pendant le calcul attendent le même
+        résultat au lieu de relancer le calcul.
+        """
+        tache = self.en_cours.get(cle)
+        if tache is None:
+            tache = asyncio.ensure_future(calcul())
+            self.en_cours[cle] = tache
+            tache.add_done_callback(lambda _: self.en_cours.pop(cle, None))
+        return await asyncio.shield(tache)
+
+    async def plan(
+            self,
+            chemin_data: Path,
+            chemin_machines: Path,
+            max_machine_gap: int,
+            max_time_gap: timedelta
+            ) -> dict:
+        """
+        Renvoie le planning chargé depuis le cache, ou le charge dans le pool.
+        La date de modification et la taille des fichiers font partie de la clé : un planning réécrit est rechargé.
+
+        :return: Dictionnaire avec "cle", "parametres", "nb_operations", "machines" et "coloriages" (coloriages déjà
+            calculés)
+        :rtype: dict
+        """
+        signature = tuple(
+            (str(chemin.resolve()), os.stat(chemin).st_mtime_ns, os.stat(chemin).st_size)
+            for chemin in (chemin_data, chemin_machines)
+        )
+        cle = ("plan", signature, max_machine_gap, max_time_gap)
+        if cle in self.plans:
+            self.plans.move_to_end(cle)
+            return self.plans[cle]
+
+        parametres = (chemin_data, chemin_machines, max_machine_gap, max_time_gap)
+
+        async def charger():
+            boucle = asyncio.get_running_loop()
+            nb_operations, mapping_machines = await boucle.run_in_executor(
+                self.executor(cle), _charger_plan, cle, *parametres
+            )
+            plan = {
+                "cle": cle,
+                "parametres": parametres,
+                "nb_operations": nb_operations,
+                "machines": mapping_machines,
+                "coloriages": {},
+            }
+            self.plans[cle] = plan
+            while len(self.plans) > self.taille_cache:
+                self.plans.popitem(last=False)
+            return plan
+
+        return await self._une_fois(cle, charger)
+
+    async def coloriage(self, requete: dict) -> dict:
+        """
+        Traite une requête de coloriage (voir le format en haut du fichier).
+
+        :param requete: Paramètres de la requête.
+        :type requete: dict
+        :return: Réponse JSON
+        :rtype: dict
+        """
+        if not isinstance(requete, dict):
+            raise ValueError("Le corps de la requête doit être un objet JSON")
+        # Un paramètre du mauvais type (liste, objet...) est une erreur de la requête, pas du service
+        try:
+            chemin_data = Path(requete["planning"])
+            chemin_machines = Path(requete.get("machines", "ressources/Machine.txt"))
+            critere = requete.get("critere", "codof")
+            nom_algo = requete.get("algo", "dsatur")
+            if critere not in Noeud.criteres_partition:
+                raise ValueError(f"Critère inconnu : {critere}")
+            if nom_algo not in ALGORITHMES:
+                raise ValueError(f"Algorithme inconnu : {nom_algo}")
+            max_machine_gap = int(requete.get("max_machine_gap", 2))
+            max_time_gap = timedelta(days=float(requete.get("max_time_gap", 21)))
+        except TypeError as erreur:
+            raise ValueError(f"Paramètre invalide : {erreur}") from erreur
+
+        plan = await self.plan(chemin_data, chemin_machines, max_machine_gap, max_time_gap)
+        cle_coloriage = (critere, nom_algo)
+        if cle_coloriage in plan["coloriages"]:
+            self.servies_par_cache += 1
+        else:
+            async def colorier():
+                boucle = asyncio.get_running_loop()
+                couleurs = await boucle.run_in_executor(
+                    self.executor(plan["cle"]), _colorier, plan["cle"], plan["parametres"], nom_algo, critere
+                )
+                plan["coloriages"][cle_coloriage] = couleurs
+                return couleurs
+
+            await self._une_fois(("coloriage", id(plan), cle_coloriage), colorier)
+        couleurs = plan["coloriages"][cle_coloriage]
+        return {
+            "planning": str(chemin_data),
+            "critere": critere,
+            "nb_operations": plan["nb_operations"],
+            "nb_couleurs": len(set(couleurs.values())),
+            "couleurs": couleurs,
+        }
+
+    def etat(self) -> dict:
+        """
+        Renvoie le contenu du cache et les compteurs du service.
+        """
+        return {
+            "plans": [
+                {
+                    "planning": cle[1][0][0],
+                    "nb_operations": plan["nb_operations"],
+                    "coloriages": [f"{critere}/{algo}" for critere, algo in plan["coloriages"]],
+                }
+                for cle, plan in self.plans.items()
+            ],
+            "calculs_en_cours": len(self.en_cours),
+            "servies_par_cache": self.servies_par_cache,
+        }
+
+    async def traiter_connexion(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Lit une requête HTTP (une requête par connexion), l'exécute et écrit la réponse JSON.
+        """
+        try:
+            ligne = (await reader.readline()).decode("latin-1").split()
+            entetes = {}
+            while True:
+                entete = (await reader.readline()).decode("latin-1").strip()
+                if not entete:
+                    break
+                nom, _, valeur = entete.partition(":")
+                entetes[nom.strip().lower()] = valeur.strip()
+            try:
+                longueur = int(entetes.get("content-length", 0))
+            except ValueError:
+                longueur = -1
+            corps = await reader.readexactly(longueur) if longueur >= 0 else b""
+
+            if len(ligne) < 2 or longueur < 0:
+                statut, reponse = 400, {"erreur": "Requête invalide"}
+            elif ligne[1] == "/etat":
+                statut, reponse = 200, self.etat()
+            elif ligne[1] != "/coloriage":
+                statut, reponse = 404, {"erreur": f"Chemin inconnu : {ligne[1]}"}
+            elif ligne[0] != "POST":
+                statut, reponse = 405, {"erreur": "Utiliser POST"}
+            else:
+                try:
+                    statut, reponse = 200, await self.coloriage(json.loads(corps or b"{}"))
+                except (KeyError, ValueError, FileNotFoundError) as erreur:
+                    statut, reponse = 400, {"erreur": repr(erreur)}
+                except Exception as erreur:
+                    statut, reponse = 500, {"erreur": repr(erreur)}
+
+            contenu = json.dumps(reponse, ensure_ascii=False).encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {statut} {STATUTS[statut]}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(contenu)}\r\n"
+                f"Connection: close\r\n\r\n".encode("latin-1")
+                + contenu
+            )
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def servir(self, hote: str = "127.0.0.1", port: int = 8765, socket: Path | None = None):
+        """
+        Démarre le serveur en TCP sur hote:port, ou sur un socket Unix si socket est donné.
+        """
+        if socket is not None:
+            serveur = await asyncio.start_unix_server(self.traiter_connexion, path=str(socket))
+        else:
+            serveur = await asyncio.start_server(self.traiter_connexion, hote, port)
+        adresses = ", ".join(str(s.getsockname()) for s in serveur.sockets)
+        print(f"Service de coloriage sur {adresses}")
+        try:
+            async with serveur:
+                await serveur.serve_forever()
+        finally:
+            for executor in self.executors:
+                executor.shutdown(cancel_futures=True)
+
+
+def parser_arguments(arguments: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Service local de coloriage (HTTP/JSON).")
+    parser.add_argument("--hote", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", type=Path, default=None, help="Socket Unix à utiliser à la place de TCP")
+    parser.add_argument("--cache", type=int, default=8, help="Nombre de plannings gardés en mémoire")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (par défaut : nombre de coeurs)")
+    return parser.parse_args(arguments)
+
+
+def main(arguments: list[str] | None = None):
+    args = parser_arguments(arguments)
+    service = ServiceColoriage(args.cache, args.workers)
+    # SIGTERM arrête le service comme Ctrl+C : servir() arrête alors les processus de calcul avant de quitter
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        asyncio.run(service.servir(args.hote, args.port, args.socket))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()